@@ -0,0 +1,27 @@
+"""
+Idempotent install/uninstall of bpy.app.handlers callbacks (depsgraph_update_post by default)
+"""
+
+import bpy
+
+# (handler list name, id()) of every handler this addon currently has installed
+_installed = set()
+
+def install(handler, handler_list="depsgraph_update_post"):
+    """Append a handler to a bpy.app.handlers list unless it is already installed"""
+    key = (handler_list, id(handler))
+    if key in _installed:
+        return
+    getattr(bpy.app.handlers, handler_list).append(handler)
+    _installed.add(key)
+
+def uninstall(handler, handler_list="depsgraph_update_post"):
+    """Remove a handler from a bpy.app.handlers list if it was installed"""
+    key = (handler_list, id(handler))
+    if key not in _installed:
+        return
+    try:
+        getattr(bpy.app.handlers, handler_list).remove(handler)
+    except ValueError:
+        pass
+    _installed.discard(key)
@@ -277,6 +277,28 @@ def refresh_animation_library():
     clear_action_cache()
     scan_animation_library()
 
+def record_nla_track(path_obj, owner_obj, track):
+    """Remember on the path object that it created this NLA track on owner_obj (for cleanup)"""
+    tracking_key = f"nla_tracks_{owner_obj.name}"
+    if tracking_key in path_obj:
+        track_names = list(path_obj[tracking_key])
+    else:
+        # First record for this owner: adopt tracks this path created before tracking existed
+        track_prefix = f"LAA_{path_obj.name}"
+        track_names = [t.name for t in owner_obj.animation_data.nla_tracks if t.name.startswith(track_prefix)]
+    if track.name not in track_names:
+        track_names.append(track.name)
+    path_obj[tracking_key] = track_names
+
+def pop_recorded_nla_tracks(path_obj, owner_obj):
+    """Return and forget the NLA track names recorded for owner_obj, or None if none were recorded"""
+    tracking_key = f"nla_tracks_{owner_obj.name}"
+    if tracking_key not in path_obj:
+        return None
+    track_names = list(path_obj[tracking_key])
+    del path_obj[tracking_key]
+    return track_names
+
 def create_discrete_speed_nla_strips(target_obj, path_obj, speed_data):
     """
     Create NLA strips with discrete speed changes that occur only at animation loop boundaries.
@@ -312,6 +334,7 @@ def create_discrete_speed_nla_strips(target_obj, path_obj, speed_data):
         nla_track = target_obj.animation_data.nla_tracks.new()
         nla_track.name = track_name
         print(f"Created discrete speed NLA track: {track_name}")
+    record_nla_track(path_obj, target_obj, nla_track)
     
     # Clear existing strips
     for strip in list(nla_track.strips):
@@ -513,6 +536,7 @@ def _create_base_pose_track(target_obj, path_obj, pose_name):
     if not base_track:
         base_track = target_obj.animation_data.nla_tracks.new()
         base_track.name = track_name
+    record_nla_track(path_obj, target_obj, base_track)
     
     # Clear existing strips
     for strip in list(base_track.strips):
@@ -554,6 +578,7 @@ def _create_end_pose_overlay(target_obj, path_obj, pose_name, start_frame):
     if not end_track:
         end_track = target_obj.animation_data.nla_tracks.new()
         end_track.name = track_name
+    record_nla_track(path_obj, target_obj, end_track)
     
     # Clear existing strips
     for strip in list(end_track.strips):
@@ -2,12 +2,29 @@ from typing import Union, Tuple, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 import math
+import numpy as np
 import bpy
 import bmesh
 from mathutils import Vector
 from bpy_extras.object_utils import AddObjectHelper
 
 
+def set_straight_spline_points(spline, start_pos, end_pos):
+    """Lay out all spline points evenly along the line from start_pos to end_pos in one foreach_set call"""
+    point_count = len(spline.points)
+    
+    start = np.array(start_pos[:3], dtype=np.float32)
+    end = np.array(end_pos[:3], dtype=np.float32)
+    ts = np.linspace(0.0, 1.0, point_count, dtype=np.float32)[:, None]
+    
+    coords = np.empty((point_count, 4), dtype=np.float32)
+    coords[:, :3] = start + ts * (end - start)
+    coords[:, 3] = 1.0
+    
+    spline.points.foreach_set("co", coords.ravel())
+    spline.id_data.update_tag()
+
+
 class AnimationPath:
     """Manages animated movement paths with pose blending."""
     
@@ -94,16 +111,7 @@ class AnimationPath:
         spline.order_u = 4
         spline.use_endpoint_u = True
         
-        direction = self.end_pos - self.start_pos
-        for i in range(5):
-            t = i / 4.0
-            if i == 0:
-                pos = self.start_pos
-            elif i == 4:
-                pos = self.end_pos
-            else:
-                pos = self.start_pos + direction * t
-            spline.points[i].co = (pos.x, pos.y, pos.z, 1.0)
+        set_straight_spline_points(spline, self.start_pos, self.end_pos)
         
         curve_obj = bpy.data.objects.new(name, curve_data)
         curve_obj.color = (0.2, 0.8, 1.0, 1.0)
@@ -199,19 +207,10 @@ class AnimationPath:
         
         start_pos = control_points.get("start", self.start_pos)
         end_pos = control_points.get("end", self.end_pos)
-        direction = end_pos - start_pos
         
         # **ONLY update curve geometry when explicitly called**
         # This prevents automatic resetting to straight lines
-        for i in range(5):
-            t = i / 4.0
-            if i == 0:
-                pos = start_pos
-            elif i == 4:
-                pos = end_pos
-            else:
-                pos = start_pos + direction * t
-            spline.points[i].co = (pos.x, pos.y, pos.z, 1.0)
+        set_straight_spline_points(spline, start_pos, end_pos)
         
         # Update internal positions only if control points moved
         if "start" in control_points:
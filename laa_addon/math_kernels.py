@@ -0,0 +1,267 @@
+"""
+Numeric kernels for path speed control, compiled with numba when it is installed
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels still run as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Curvature is |turn angle - 90°| / 90, so a straight run measures 1.0 and a right angle 0.0;
+# deviations below this many degrees are snapped to 0
+MIN_DEVIATION_DEGREES = 2.0
+
+# Smoothed curvature spreads below this are rounding noise (e.g. a straight line or a circular arc),
+# the speed profile is then uniform
+CURVATURE_RANGE_EPSILON = 1e-9
+
+def speed_profile_frame_positions(positions, total_frames, curvature_threshold,
+                                  min_speed_factor, max_speed_factor, step=3, window_size=10):
+    """
+    Map every frame in 0..total_frames to a 0-1 path position, slowing down on sharp curves.
+    positions: (N, 3) float64 array of world-space samples along the path
+    Returns None when the speed profile is uniform (every sample has the same smoothed curvature,
+    e.g. a straight line), so the path position is linear in the frame.
+    Uses the fused numba kernel when numba is installed, otherwise NumPy.
+    """
+    if NUMBA_AVAILABLE:
+        frame_positions = _speed_profile_jit(np.ascontiguousarray(positions, dtype=np.float64), total_frames,
+                                             curvature_threshold, min_speed_factor, max_speed_factor,
+                                             step, window_size)
+        # The kernel signals a uniform profile with an empty array (numba needs one return type)
+        return frame_positions if len(frame_positions) else None
+    return _speed_profile_numpy(positions, total_frames, curvature_threshold,
+                                min_speed_factor, max_speed_factor, step, window_size)
+
+def _compute_curvatures(positions, step=3, min_deviation_degrees=MIN_DEVIATION_DEGREES):
+    """
+    Curvature (0-1) at each sample of an (N, 3) positions array, measured over +/- step samples.
+    Uses the numba kernel when numba is installed, otherwise NumPy.
+    """
+    if NUMBA_AVAILABLE:
+        return _curvatures_jit(np.ascontiguousarray(positions, dtype=np.float64), step, min_deviation_degrees)
+    return _curvatures_numpy(positions, step, min_deviation_degrees)
+
+def _curvatures_numpy(pos, step, min_deviation_degrees):
+    """Vectorized NumPy implementation of _compute_curvatures"""
+    if len(pos) > 2 * step:
+        # Vectors from each point to its backward and forward neighbours
+        center = pos[step:-step]
+        v1 = pos[:-2 * step] - center
+        v2 = pos[2 * step:] - center
+
+        # Normalize (zero-length vectors stay zero, like Vector.normalized())
+        n1 = np.linalg.norm(v1, axis=1, keepdims=True)
+        n2 = np.linalg.norm(v2, axis=1, keepdims=True)
+        v1 = v1 / np.where(n1 > 0.0, n1, 1.0)
+        v2 = v2 / np.where(n2 > 0.0, n2, 1.0)
+
+        # Angle between the vectors, clamped to avoid numerical errors with arccos
+        dot_product = np.clip(np.einsum('ij,ij->i', v1, v2), -1.0, 1.0)
+        turn_angle = np.pi - np.arccos(dot_product)
+
+        # Use deviation from 90° as curvature measure, normalized by max possible deviation
+        deviation_from_90 = np.abs(np.degrees(turn_angle) - 90.0)
+        curv = np.where(deviation_from_90 < min_deviation_degrees, 0.0, deviation_from_90 / 90.0)
+
+        # Handle edge cases (first and last points)
+        curvatures = np.empty(len(curv) + 2)
+        curvatures[1:-1] = curv
+        curvatures[0] = curv[0]
+        curvatures[-1] = curv[-1]
+    else:
+        curvatures = np.zeros(len(pos))
+
+    return curvatures
+
+@njit(cache=True)
+def _curvatures_jit(pos, step, min_deviation_degrees):
+    """Loop implementation of _compute_curvatures for numba, the deviation from 90° is measured in radians"""
+    n = pos.shape[0]
+    if n <= 2 * step:
+        return np.zeros(n)
+
+    acos = math.acos
+    sqrt = math.sqrt
+    half_pi = 0.5 * math.pi
+    min_deviation = math.radians(min_deviation_degrees)
+
+    # First and last interior values are repeated once at each end
+    inner = n - 2 * step
+    count = inner + 2
+    curvatures = np.empty(count)
+    for i in range(inner):
+        c = i + step
+        v1x = pos[i, 0] - pos[c, 0]
+        v1y = pos[i, 1] - pos[c, 1]
+        v1z = pos[i, 2] - pos[c, 2]
+        v2x = pos[c + step, 0] - pos[c, 0]
+        v2y = pos[c + step, 1] - pos[c, 1]
+        v2z = pos[c + step, 2] - pos[c, 2]
+        l1 = sqrt(v1x * v1x + v1y * v1y + v1z * v1z)
+        l2 = sqrt(v2x * v2x + v2y * v2y + v2z * v2z)
+        if l1 == 0.0:
+            l1 = 1.0
+        if l2 == 0.0:
+            l2 = 1.0
+        dot = (v1x * v2x + v1y * v2y + v1z * v2z) / (l1 * l2)
+        dot = min(1.0, max(-1.0, dot))
+        deviation = abs(half_pi - acos(dot))
+        curvatures[i + 1] = 0.0 if deviation < min_deviation else deviation / half_pi
+    curvatures[0] = curvatures[1]
+    curvatures[count - 1] = curvatures[count - 2]
+
+    return curvatures
+
+def _speed_profile_numpy(positions, total_frames, curvature_threshold,
+                         min_speed_factor, max_speed_factor, step, window_size):
+    """Vectorized NumPy implementation of speed_profile_frame_positions"""
+    # Calculate curvature at each point along the curve mesh
+    curvatures = _curvatures_numpy(positions, step, MIN_DEVIATION_DEGREES)
+
+    # Apply threshold to filter out very small curvatures
+    thresholded_curvatures = np.where(curvatures < curvature_threshold, 0.0, curvatures)
+
+    # Smooth curvatures to avoid jitter (moving average via prefix sums, windows shrink at the ends)
+    count = len(thresholded_curvatures)
+    prefix_sums = np.concatenate(([0.0], np.cumsum(thresholded_curvatures)))
+    idx = np.arange(count)
+    lo = np.maximum(0, idx - window_size // 2)
+    hi = np.minimum(count, idx + window_size // 2 + 1)
+    smoothed = (prefix_sums[hi] - prefix_sums[lo]) / (hi - lo)
+    # Prefix-sum differences leave rounding residue where a window is all zeros, snap it back
+    smoothed[np.abs(smoothed) < 1e-12] = 0.0
+
+    # A uniform profile (all curvatures identical or zero) means every speed is 1.0: linear motion
+    if count == 0:
+        return None
+    min_curvature = smoothed.min()
+    max_curvature = smoothed.max()
+    if not (max_curvature - min_curvature > CURVATURE_RANGE_EPSILON and max_curvature > 0):
+        return None
+
+    # Convert curvatures to speeds: high curvature = low speed, zero-curvature samples keep maximum speed
+    normalized = (smoothed - min_curvature) / (max_curvature - min_curvature)
+    speeds = np.where(smoothed == 0.0, 1.0, 1.0 - normalized)
+
+    # Calculate cumulative distances based on speeds
+    avg_speeds = 0.5 * (speeds[:-1] + speeds[1:])
+    segment_distances = min_speed_factor + avg_speeds * (max_speed_factor - min_speed_factor)
+    cumulative_distances = np.concatenate(([0.0], np.cumsum(segment_distances)))
+
+    # Normalize cumulative distances to 0-1 range
+    total_distance = cumulative_distances[-1]
+    if total_distance > 0:
+        normalized_positions = cumulative_distances / total_distance
+    else:
+        normalized_positions = np.linspace(0.0, 1.0, len(cumulative_distances))
+
+    # Map each frame's linear progress onto the speed-adjusted path position.
+    # The samples sit on a uniform 0-1 grid, so each frame's segment index is computed directly
+    # instead of searched for.
+    frame_progress = np.arange(total_frames + 1) / total_frames
+    sample_count = len(normalized_positions)
+    if sample_count > 1:
+        x = frame_progress * (sample_count - 1)
+        k = np.minimum(x.astype(np.int64), sample_count - 2)
+        local_t = x - k
+        frame_positions = normalized_positions[k] + local_t * (normalized_positions[k + 1] - normalized_positions[k])
+    else:
+        frame_positions = frame_progress
+
+    # Ensure positions stay within bounds
+    frame_positions = np.clip(frame_positions, 0.0, 1.0)
+
+    return frame_positions
+
+@njit(cache=True)
+def _speed_profile_jit(pos, total_frames, curvature_threshold,
+                       min_speed_factor, max_speed_factor, step, window_size):
+    """Loop implementation of speed_profile_frame_positions for numba"""
+    # Curvature per sample
+    curvatures = _curvatures_jit(pos, step, MIN_DEVIATION_DEGREES)
+    count = curvatures.shape[0]
+
+    # Apply threshold to filter out very small curvatures
+    for i in range(count):
+        if curvatures[i] < curvature_threshold:
+            curvatures[i] = 0.0
+
+    # Moving-average smoothing, windows shrink at the ends
+    half = window_size // 2
+    smoothed = np.empty(count)
+    min_curvature = 0.0
+    max_curvature = 0.0
+    for i in range(count):
+        lo = max(0, i - half)
+        hi = min(count, i + half + 1)
+        total = 0.0
+        for j in range(lo, hi):
+            total += curvatures[j]
+        value = total / (hi - lo)
+        smoothed[i] = value
+        if i == 0 or value < min_curvature:
+            min_curvature = value
+        if i == 0 or value > max_curvature:
+            max_curvature = value
+
+    # A uniform profile (all curvatures identical or zero) means every speed is 1.0: linear motion
+    if count == 0 or not (max_curvature - min_curvature > CURVATURE_RANGE_EPSILON and max_curvature > 0.0):
+        return np.empty(0)
+
+    # Curvature -> speed -> cumulative distance
+    curvature_range = max_curvature - min_curvature
+    cumulative = np.empty(count)
+    cumulative[0] = 0.0
+    previous_speed = 1.0
+    for i in range(count):
+        speed = 1.0
+        if smoothed[i] != 0.0:
+            speed = 1.0 - (smoothed[i] - min_curvature) / curvature_range
+        if i > 0:
+            avg_speed = 0.5 * (previous_speed + speed)
+            cumulative[i] = cumulative[i - 1] + min_speed_factor + avg_speed * (max_speed_factor - min_speed_factor)
+        previous_speed = speed
+
+    # Per-frame linear interpolation over the normalized cumulative distances
+    total_distance = cumulative[count - 1]
+    frame_positions = np.empty(total_frames + 1)
+    for f in range(total_frames + 1):
+        progress = f / total_frames
+        if count > 1:
+            x = progress * (count - 1)
+            k = min(int(x), count - 2)
+            local_t = x - k
+            if total_distance > 0.0:
+                a = cumulative[k] / total_distance
+                b = cumulative[k + 1] / total_distance
+            else:
+                a = k / (count - 1)
+                b = (k + 1) / (count - 1)
+            position = a + local_t * (b - a)
+        else:
+            position = progress
+        frame_positions[f] = min(1.0, max(0.0, position))
+
+    return frame_positions
+
+@njit(cache=True)
+def path_yaw(dx, dy, dz):
+    """
+    Z rotation that faces a flat path along the direction (dx, dy, dz).
+    Returns pi (the default facing) for directions shorter than 0.001.
+    """
+    if math.sqrt(dx * dx + dy * dy + dz * dz) <= 0.001:
+        return math.pi
+    # atan2(x, y) gives the angle from the Y axis; negate and add pi for the path facing
+    return -math.atan2(dx, dy) + math.pi
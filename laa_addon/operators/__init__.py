@@ -1,6 +1,6 @@
 import bpy
 from bpy.app.handlers import persistent
-from mathutils import Vector
+from contextlib import contextmanager
 
 try:
     from . import path_operators
@@ -11,17 +11,64 @@ except ImportError:
     import animation_operators
     import utility_operators
 
-# Global variable to prevent infinite recursion during property updates
-_updating_properties = False
+try:
+    from .animation_operators_utils import get_control_point_objects
+    from ..animation_path import AnimationPath
+    from .. import _handler
+except ImportError:
+    from animation_operators_utils import get_control_point_objects
+    from animation_path import AnimationPath
+    import _handler
+
+# Re-entrancy flag shared by the panel <-> path sync functions (a list cell so no `global` is needed)
+_guard = [False]
+
+@contextmanager
+def _reentrant():
+    """Yield True and hold the guard, or yield False if a sync is already in progress"""
+    if _guard[0]:
+        yield False
+        return
+    _guard[0] = True
+    try:
+        yield True
+    finally:
+        _guard[0] = False
+
+# Name of the animation path that was active on the last handler call
+_last_active_path = None
+
+# session_uid of every animation path object, rebuilt whenever the object count changes
+# (and after every file load, which hands out new session_uids)
+_animation_path_uids = set()
+_path_uids_object_count = -1
+
+def _refresh_animation_path_uids():
+    """Rescan bpy.data.objects for animation paths if objects were added or removed"""
+    global _path_uids_object_count
+    objs = bpy.data.objects
+    if len(objs) == _path_uids_object_count:
+        return
+    _animation_path_uids.clear()
+    _animation_path_uids.update(o.session_uid for o in objs if o.get("is_animation_path"))
+    _path_uids_object_count = len(objs)
+
+@persistent
+def animation_path_uids_load_handler(*args):
+    """Force a uid rescan after a file load or revert, even if the object count matches"""
+    global _path_uids_object_count, _last_active_path
+    _path_uids_object_count = -1
+    _last_active_path = None
 
 def load_path_properties_from_object(context, path_obj):
     """Load properties from a path object into the properties panel"""
-    global _updating_properties
-    if _updating_properties or not path_obj or not path_obj.get("is_animation_path"):
+    if not path_obj or not path_obj.get("is_animation_path"):
         return
     
-    _updating_properties = True
-    try:
+    with _reentrant() as entered:
+        if not entered:
+            return
+        
         props = context.scene.animation_path_props
         
         props.start_frame = path_obj.get("start_frame", 1)
@@ -43,23 +90,52 @@ def load_path_properties_from_object(context, path_obj):
             props.target_object = None
         
         # Load positions from control points (DON'T update curve geometry)
-        for point_type in ["start", "end"]:
-            point_name = path_obj.get(f"{point_type}_control_point")
-            if point_name:
-                point_obj = bpy.data.objects.get(point_name)
-                if point_obj:
-                    setattr(props, f"{point_type}_pos", point_obj.location)
+        sp, ep = get_control_point_objects(path_obj)
+        if sp:
+            props.start_pos = sp.location
+        if ep:
+            props.end_pos = ep.location
         
         # Store reference to currently selected path
         context.scene["_selected_animation_path"] = path_obj.name
         
-    finally:
-        _updating_properties = False
+        if context.scene.get("_laa_dirty"):
+            context.scene["_laa_dirty"] = False
+
+def _path_matches_properties(path_obj, props):
+    """Check whether a path object already stores every value update_path_from_properties would write"""
+    # Read from the path itself rather than a cache, so undo/redo, file loads, renames and
+    # external id-property edits can't make the comparison stale
+    stored = (path_obj.get("start_frame"), path_obj.get("end_frame"),
+              path_obj.get("start_pose"), path_obj.get("end_pose"), path_obj.get("anim"),
+              path_obj.get("start_blend_frames"), path_obj.get("end_blend_frames"),
+              path_obj.get("anim_speed_mult"), path_obj.get("use_rotation"),
+              path_obj.get("object_z_offset"))
+    wanted = (props.start_frame, props.end_frame, props.start_pose, props.end_pose, props.anim,
+              props.start_blend_frames, props.end_blend_frames, props.anim_speed_mult,
+              bool(props.use_rotation), props.object_z_offset)
+    if stored != wanted:
+        return False
+    
+    # An empty target is never written, so only a set target has to match
+    if props.target_object and path_obj.get("target_object") != props.target_object.name:
+        return False
+    
+    data = path_obj.data
+    if data is not None and hasattr(data, 'path_duration'):
+        if data.path_duration != props.end_frame - props.start_frame:
+            return False
+    
+    sp, ep = get_control_point_objects(path_obj)
+    if sp and tuple(sp.location) != tuple(props.start_pos):
+        return False
+    if ep and tuple(ep.location) != tuple(props.end_pos):
+        return False
+    return True
 
 def update_path_from_properties(context):
     """Update the selected path object from current properties"""
-    global _updating_properties
-    if _updating_properties:
+    if _guard[0]:
         return
     
     selected_path_name = context.scene.get("_selected_animation_path")
@@ -70,97 +146,116 @@ def update_path_from_properties(context):
     if not path_obj or not path_obj.get("is_animation_path"):
         return
     
-    _updating_properties = True
-    try:
-        from mathutils import Vector
-        props = context.scene.animation_path_props
+    # Skip validation and writes when the path already holds the panel values
+    props = context.scene.animation_path_props
+    if _path_matches_properties(path_obj, props):
+        return
+    
+    with _reentrant() as entered:
+        if not entered:
+            return
         
-        # Import AnimationPath here to avoid circular imports
         try:
-            from ..animation_path import AnimationPath
-        except ImportError:
-            from animation_path import AnimationPath
-        
-        # Create AnimationPath to validate properties
-        path = AnimationPath(
-            start_pos=props.start_pos,
-            start_frame=props.start_frame,
-            end_pos=props.end_pos,
-            end_frame=props.end_frame,
-            start_pose=props.start_pose,
-            end_pose=props.end_pose,
-            anim=props.anim,
-            start_blend_frames=props.start_blend_frames,
-            end_blend_frames=props.end_blend_frames,
-            anim_speed_mult=props.anim_speed_mult
-        )
-        
-        # Update path object properties
-        path_obj["start_frame"] = path.start_frame
-        path_obj["end_frame"] = path.end_frame
-        path_obj["start_pose"] = path.start_pose
-        path_obj["end_pose"] = path.end_pose
-        path_obj["anim"] = path.anim
-        path_obj["start_blend_frames"] = path.start_blend_frames
-        path_obj["end_blend_frames"] = path.end_blend_frames
-        path_obj["anim_speed_mult"] = path.anim_speed_mult
-        path_obj["use_rotation"] = props.use_rotation
-        path_obj["object_z_offset"] = props.object_z_offset
-        
-        # Update curve data's path_duration
-        if path_obj.data and hasattr(path_obj.data, 'path_duration'):
-            path_obj.data.path_duration = path.duration
-            print(f"Updated path_duration to {path.duration} frames")
-        
-        if props.target_object:
-            path_obj["target_object"] = props.target_object.name
-        
-        # Update control point positions if they exist
-        for point_type in ["start", "end"]:
-            point_name = path_obj.get(f"{point_type}_control_point")
-            if point_name:
-                point_obj = bpy.data.objects.get(point_name)
-                if point_obj:
-                    new_pos = getattr(props, f"{point_type}_pos")
-                    point_obj.location = new_pos
-        
-    except ValueError as e:
-        # If validation fails, revert to previous values
-        load_path_properties_from_object(context, path_obj)
-    finally:
-        _updating_properties = False
+            # Create AnimationPath to validate properties
+            path = AnimationPath(
+                start_pos=props.start_pos,
+                start_frame=props.start_frame,
+                end_pos=props.end_pos,
+                end_frame=props.end_frame,
+                start_pose=props.start_pose,
+                end_pose=props.end_pose,
+                anim=props.anim,
+                start_blend_frames=props.start_blend_frames,
+                end_blend_frames=props.end_blend_frames,
+                anim_speed_mult=props.anim_speed_mult
+            )
+            
+            # Update path object properties in a single batch
+            path_values = {
+                "start_frame": path.start_frame,
+                "end_frame": path.end_frame,
+                "start_pose": path.start_pose,
+                "end_pose": path.end_pose,
+                "anim": path.anim,
+                "start_blend_frames": path.start_blend_frames,
+                "end_blend_frames": path.end_blend_frames,
+                "anim_speed_mult": path.anim_speed_mult,
+                "use_rotation": bool(props.use_rotation),
+                "object_z_offset": props.object_z_offset,
+            }
+            if props.target_object:
+                path_values["target_object"] = props.target_object.name
+            path_obj.id_properties_ensure().update(path_values)
+            
+            # Update curve data's path_duration (only when it changed, the write re-tags the curve)
+            data = path_obj.data
+            if data is not None and hasattr(data, 'path_duration'):
+                if data.path_duration != path.duration:
+                    data.path_duration = path.duration
+            
+            # Update control point positions if they exist
+            sp, ep = get_control_point_objects(path_obj)
+            if sp:
+                sp.location = props.start_pos
+            if ep:
+                ep.location = props.end_pos
+            
+            path_obj.update_tag(refresh={'OBJECT'})
+            
+        except ValueError as e:
+            # If validation fails, revert to previous values
+            load_path_properties_from_object(context, path_obj)
 
 @persistent
 def selection_changed_handler(scene, depsgraph):
     """Handler called when selection changes"""
+    # Depsgraph updates fire every frame during playback and render, selection can't change then
+    screen = getattr(bpy.context, "screen", None)
+    if screen is not None and screen.is_animation_playing:
+        return
+    if bpy.app.is_job_running('RENDER'):
+        return
+    
     if not hasattr(bpy.context, 'active_object'):
         return
     
+    global _last_active_path
     active_obj = bpy.context.active_object
-    if active_obj and active_obj.get("is_animation_path"):
-        load_path_properties_from_object(bpy.context, active_obj)
+    if active_obj is None:
+        _last_active_path = None
+        return
+    
+    _refresh_animation_path_uids()
+    if active_obj.session_uid not in _animation_path_uids:
+        # The object may have become a path without the object count changing
+        if not active_obj.get("is_animation_path"):
+            _last_active_path = None
+            return
+        _animation_path_uids.add(active_obj.session_uid)
+    
+    # Skip the reload while the same path stays active and nothing marked it dirty
+    if _last_active_path == active_obj.name and not scene.get("_laa_dirty"):
+        return
+    
+    _last_active_path = active_obj.name
+    load_path_properties_from_object(bpy.context, active_obj)
 
 def register():
     """Register all operator modules"""
-    try:
-        unregister()
-    except:
-        pass
-    
-    # Register all operator modules
+    # Register all operator modules (each replaces stale classes from a previous load)
     path_operators.register()
     animation_operators.register()
     utility_operators.register()
     
-    # Register the selection change handler
-    if selection_changed_handler not in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.append(selection_changed_handler)
+    # Register the selection change handler and the file-load uid reset
+    _handler.install(selection_changed_handler)
+    _handler.install(animation_path_uids_load_handler, "load_post")
 
 def unregister():
     """Unregister all operator modules"""
-    # Unregister the selection change handler
-    if selection_changed_handler in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.remove(selection_changed_handler)
+    # Unregister the selection change handler and the file-load uid reset
+    _handler.uninstall(animation_path_uids_load_handler, "load_post")
+    _handler.uninstall(selection_changed_handler)
     
     # Unregister all operator modules
     utility_operators.unregister()
@@ -5,10 +5,30 @@ Animation-related operators for path following and object animation with pose/an
 import bpy
 import bmesh
 import math
+import numpy as np
 from mathutils import Vector
 from bpy.types import Operator
 
-from .animation_operators_utils import clear_selective_animation, apply_speed_control, store_keyframe_tracking_data, get_constraint_keyframe_frames, push_down_action_manual
+from .animation_operators_utils import get_control_point_objects, find_armature, set_constraint_keyframes, insert_keyframe_fast, update_action_fcurves, clear_selective_animation, apply_speed_control, store_keyframe_tracking_data, get_constraint_keyframe_frames, push_down_action_manual, register_classes, unregister_classes
+
+try:
+    from .. import animation_library
+    from ..math_kernels import path_yaw
+except ImportError:
+    import animation_library
+    from math_kernels import path_yaw
+
+# Half turn around Z, used as the default facing when following a path
+_PI = math.pi
+
+# Rotation keyed at the path start when the curve drives the facing
+_INITIAL_ROT = (0.0, 0.0, _PI)
+
+# Rotation used when the path direction cannot be determined
+_FALLBACK_ROT = (0.0, 0.0, _PI)
+
+# Splines with more points than this are read in bulk with foreach_get
+_BULK_READ_MIN_POINTS = 8
 
 class ANIMPATH_OT_animate_object_along_path(Operator):
     """Animate the assigned object along the selected path using Follow Path constraint and apply poses/animations"""
@@ -23,7 +43,10 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
             self.report({'ERROR'}, "No Animation Path selected")
             return {'CANCELLED'}
         
-        target_obj_name = path_obj.get("target_object")
+        # Fetch all custom properties once instead of one IDProperty lookup per setting
+        path_props = dict(path_obj.items())
+        
+        target_obj_name = path_props.get("target_object")
         if not target_obj_name:
             self.report({'ERROR'}, "No target object assigned to this path")
             return {'CANCELLED'}
@@ -40,45 +63,46 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
         
         try:
             # Get animation properties
-            start_frame = path_obj.get("start_frame", 1)
-            end_frame = path_obj.get("end_frame", 100)
-            use_rotation = path_obj.get("use_rotation", True)
-            object_z_offset = path_obj.get("object_z_offset", 0.0)
+            start_frame = path_props.get("start_frame", 1)
+            end_frame = path_props.get("end_frame", 100)
+            use_rotation = path_props.get("use_rotation", True)
+            object_z_offset = path_props.get("object_z_offset", 0.0)
             
             # Create offset vector from Z offset only
             object_offset = Vector((0.0, 0.0, object_z_offset))
             
             # Get pose and animation settings
-            start_pose = path_obj.get("start_pose", "NONE")
-            end_pose = path_obj.get("end_pose", "NONE")
-            main_anim = path_obj.get("anim", "NONE")
-            start_blend_frames = path_obj.get("start_blend_frames", 0)
-            end_blend_frames = path_obj.get("end_blend_frames", 0)
+            start_pose = path_props.get("start_pose", "NONE")
+            end_pose = path_props.get("end_pose", "NONE")
+            main_anim = path_props.get("anim", "NONE")
+            start_blend_frames = path_props.get("start_blend_frames", 0)
+            end_blend_frames = path_props.get("end_blend_frames", 0)
             
             # Ensure curve data path_duration matches the frame range
-            if path_obj.data and hasattr(path_obj.data, 'path_duration'):
+            path_data = path_obj.data
+            if path_data and hasattr(path_data, 'path_duration'):
                 new_duration = end_frame - start_frame
-                if path_obj.data.path_duration != new_duration:
-                    path_obj.data.path_duration = new_duration
+                if path_data.path_duration != new_duration:
+                    path_data.path_duration = new_duration
                     print(f"Updated curve path_duration to {new_duration} frames")
             
+            # Resolved once for both the animation cleanup and the rig animations
+            armature_obj = find_armature(target_obj)
+            
             props = context.scene.animation_path_props
             if props.clear_existing_animation:
                 # Use the new precise clearing with path object
-                clear_selective_animation(target_obj, start_frame, end_frame, path_obj)
+                clear_selective_animation(target_obj, start_frame, end_frame, path_obj, armature_obj)
 
             # Always perform constraint Removal
             constraint_name = f"FollowPath_{path_obj.name}"
-            constraints_to_remove = []
-
-            for constraint in target_obj.constraints:
-                if (constraint.type == 'FOLLOW_PATH' and 
-                    constraint.target == path_obj):
-                    constraints_to_remove.append(constraint)
-                # Also check by name pattern as backup
-                elif (constraint.type == 'FOLLOW_PATH' and 
-                      constraint.name == constraint_name):
-                    constraints_to_remove.append(constraint)
+            # Match by target, or by name pattern as backup; collected first so removal
+            # never mutates the collection being iterated
+            constraints_to_remove = [
+                constraint for constraint in target_obj.constraints
+                if constraint.type == 'FOLLOW_PATH'
+                and (constraint.target == path_obj or constraint.name == constraint_name)
+            ]
 
             for constraint in constraints_to_remove:
                 print(f"Removing existing FollowPath constraint: {constraint.name}")
@@ -87,16 +111,13 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
             # Also clean up any orphaned constraint keyframes
             if target_obj.animation_data and target_obj.animation_data.action:
                 action = target_obj.animation_data.action
-                fcurves_to_remove = []
-                
-                for fcurve in action.fcurves:
-                    if (fcurve.data_path.startswith('constraints[') and 
-                        f'"{constraint_name}"' in fcurve.data_path):
-                        fcurves_to_remove.append(fcurve)
+                constraint_prefix = f'constraints["{constraint_name}"]'
+                fcurves_to_remove = [fcurve for fcurve in action.fcurves
+                                     if fcurve.data_path.startswith(constraint_prefix)]
                 
                 for fcurve in fcurves_to_remove:
+                    print(f"Removing orphaned constraint fcurve: {fcurve.data_path}")
                     action.fcurves.remove(fcurve)
-                    print(f"Removed orphaned constraint fcurve: {fcurve.data_path}")
 
             # Create Follow Path constraint for object movement
             follow_path = target_obj.constraints.new(type='FOLLOW_PATH')
@@ -127,13 +148,11 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
             # Handle rotation based on use_rotation setting
             if use_rotation:
                 # When use_rotation is True, set initial rotation and let curve following handle the rest
-                context.scene.frame_set(start_frame)
-                
                 # Get initial direction from curve and set rotation
-                initial_rotation = (0, 0, math.radians(180))
+                initial_rotation = _INITIAL_ROT
                 animation_target.rotation_euler = initial_rotation
-                animation_target.keyframe_insert(data_path="rotation_euler", frame=start_frame)
-                animation_target.keyframe_insert(data_path="rotation_euler", frame=end_frame)
+                insert_keyframe_fast(animation_target, "rotation_euler", start_frame, initial_rotation)
+                insert_keyframe_fast(animation_target, "rotation_euler", end_frame, initial_rotation)
                 
                 # Track these keyframes
                 keyframe_data["rotation_euler"].extend([start_frame, end_frame])
@@ -144,39 +163,37 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
                 # Keyframe current rotation to prevent unwanted rotation
                 current_rotation = animation_target.rotation_euler.copy()
                 animation_target.rotation_euler = current_rotation
-                animation_target.keyframe_insert(data_path="rotation_euler", frame=start_frame)
-                animation_target.keyframe_insert(data_path="rotation_euler", frame=end_frame)
-                animation_target.keyframe_insert(data_path="rotation_euler", frame=end_frame + 1)
+                insert_keyframe_fast(animation_target, "rotation_euler", start_frame, current_rotation)
+                insert_keyframe_fast(animation_target, "rotation_euler", end_frame, current_rotation)
+                insert_keyframe_fast(animation_target, "rotation_euler", end_frame + 1, current_rotation)
                 
                 # Track these keyframes
                 keyframe_data["rotation_euler"].extend([start_frame, end_frame, end_frame + 1])
             
-            # Position keyframes with offset
-            context.scene.frame_set(start_frame)
-            start_pos = self._get_control_point_position(path_obj, "start")
+            # Position keyframes with offset (keys are written at explicit frames, no frame change needed)
+            start_pos, end_pos = self._get_start_end_positions(path_obj, path_props)
             
+            # The offset is held for the whole path, so one CONSTANT key at the start covers
+            # the range up to the end + 1 key (no separate identical key at end_frame)
             animation_target.location = object_offset
-            animation_target.keyframe_insert(data_path="location", frame=start_frame)
+            insert_keyframe_fast(animation_target, "location", start_frame, object_offset,
+                                 interpolation='CONSTANT')
             keyframe_data["location"].append(start_frame)
 
-            # Position at end
-            context.scene.frame_set(end_frame)
-            animation_target.location = object_offset
-            animation_target.keyframe_insert(data_path="location", frame=end_frame)
-            keyframe_data["location"].append(end_frame)
-
             # Final position after path ends
-            end_pos = self._get_control_point_position(path_obj, "end")
             if end_pos:
-                animation_target.location = end_pos + object_offset
-                animation_target.keyframe_insert(data_path="location", frame=end_frame + 1)
+                final_location = Vector(end_pos) + object_offset
+                animation_target.location = final_location
+                insert_keyframe_fast(animation_target, "location", end_frame + 1, final_location)
                 keyframe_data["location"].append(end_frame + 1)
 
+            # Sort the fast-inserted transform keys before anything evaluates them
+            update_action_fcurves(animation_target)
+
             # Use Fixed Location for speed control
             follow_path.use_fixed_location = True
 
             # Animate constraint offset
-            props = context.scene.animation_path_props
             use_curvature = props.use_curvature_control
 
             if use_curvature:
@@ -187,7 +204,8 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
                     max_speed_factor=props.max_speed_factor,
                     use_keyframe_reduction=props.use_keyframe_reduction,
                     use_blend_speed=props.blend_speed,
-                    error_tolerance=props.keyframe_error_tolerance
+                    error_tolerance=props.keyframe_error_tolerance,
+                    depsgraph=context.evaluated_depsgraph_get()
                 )
                 
                 if success:
@@ -214,60 +232,36 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
                 keyframe_data["constraints"][follow_path.name]["offset_factor"].extend([start_frame, end_frame])
                 speed_info = "with bezier ease in/out"
 
-            # Control constraint influence
-            follow_path.influence = 0.0
-            follow_path.keyframe_insert(data_path="influence", frame=end_frame + 1)
-            follow_path.keyframe_insert(data_path="influence", frame=start_frame - 1)
-            keyframe_data["constraints"][follow_path.name]["influence"].extend([start_frame - 1, end_frame + 1])
-            
-            follow_path.influence = 1.0
-            follow_path.keyframe_insert(data_path="influence", frame=start_frame)
-            follow_path.keyframe_insert(data_path="influence", frame=end_frame)
-            keyframe_data["constraints"][follow_path.name]["influence"].extend([start_frame, end_frame])
+            # Control constraint influence (only active between start and end frame)
+            set_constraint_keyframes(follow_path, "influence", [
+                (start_frame - 1, 0.0),
+                (start_frame, 1.0),
+                (end_frame, 1.0),
+                (end_frame + 1, 0.0),
+            ], interpolation='CONSTANT')
+            keyframe_data["constraints"][follow_path.name]["influence"].extend([start_frame - 1, start_frame, end_frame, end_frame + 1])
 
             # Final rotation after path ends
             if use_rotation:
-                context.scene.frame_set(end_frame)
-                context.view_layer.update()  # Force scene update
-                context.evaluated_depsgraph_get().update()  # Force dependency graph update
-                
-                # Now capture the actual constrained rotation
-                world_matrix = animation_target.matrix_world.copy()
-                final_rotation = world_matrix.to_euler()
+                # Derive the facing at the path end from the curve tangent instead of
+                # evaluating the constrained object at end_frame
+                final_rotation = self._calculate_final_rotation(path_obj)
                 
                 # Apply this rotation to end_frame + 1 (unconstrained)
-                context.scene.frame_set(end_frame + 1)
                 animation_target.rotation_euler = final_rotation
-                animation_target.keyframe_insert(data_path="rotation_euler", frame=end_frame + 1)
+                insert_keyframe_fast(animation_target, "rotation_euler", end_frame + 1, final_rotation)
+                update_action_fcurves(animation_target)
                 keyframe_data["rotation_euler"].append(end_frame + 1)
 
-            # Set interpolation for path animation
-            if animation_target.animation_data and animation_target.animation_data.action:
-                for fcurve in animation_target.animation_data.action.fcurves:
-                    if fcurve.data_path.endswith("influence"):
-                        for keyframe in fcurve.keyframe_points:
-                            keyframe.interpolation = 'CONSTANT'
-        
-            context.view_layer.update()
-
-            # Only select if object is in current view layer
-            if animation_target.name in context.view_layer.objects:
-                bpy.ops.object.select_all(action='DESELECT')
-                animation_target.select_set(True)
-                context.view_layer.objects.active = animation_target
-
-                # If there is not dynamic speed on the curves, just animate the default follow path
-                if not use_curvature:
-                    bpy.ops.constraint.followpath_path_animate(
-                        constraint=follow_path.name,
-                        owner='OBJECT'
-                    )
+            # If there is not dynamic speed on the curves, just animate the default follow path
+            if not use_curvature:
+                _animate_path_eval_time(path_obj.data)
             
             # Store the keyframe tracking data AFTER all keyframes have been created
             store_keyframe_tracking_data(path_obj, target_obj, follow_path.name, keyframe_data)
             
             # Apply poses and animations to rig (if target is an armature or has an armature child)
-            self._apply_rig_animations(target_obj, path_obj, start_frame, end_frame,
+            self._apply_rig_animations(target_obj, armature_obj, path_obj, follow_path, start_frame, end_frame,
                                      start_pose, end_pose, main_anim,
                                      start_blend_frames, end_blend_frames)
 
@@ -297,20 +291,12 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
                                            start_blend_frames, end_blend_frames):
             """Apply your original bezier-based speed control"""
             # Animate constraint offset (your original code)
-            follow_path.offset_factor = 0.0
-            follow_path.keyframe_insert(data_path="offset_factor", frame=start_frame)
-
-            follow_path.offset_factor = 1.0
-            follow_path.keyframe_insert(data_path="offset_factor", frame=end_frame)
-
-            action = follow_path.id_data.animation_data.action
-            fcurve = action.fcurves.find(f"constraints[\"{follow_path.name}\"].offset_factor")
+            fcurve = set_constraint_keyframes(follow_path, "offset_factor", [
+                (start_frame, 0.0),
+                (end_frame, 1.0),
+            ], interpolation='BEZIER')
 
             if fcurve:
-                # Set both keyframes to bezier
-                fcurve.keyframe_points[0].interpolation = 'BEZIER'
-                fcurve.keyframe_points[1].interpolation = 'BEZIER'
-                
                 # Set handle types to free so we can manually position them
                 fcurve.keyframe_points[0].handle_right_type = 'FREE'
                 fcurve.keyframe_points[1].handle_left_type = 'FREE'
@@ -324,12 +310,9 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
                 blend_out_frame = end_frame - end_blend_frames
                 fcurve.keyframe_points[1].handle_left = (blend_out_frame, 1.0)
     
-    def _apply_rig_animations(self, target_obj, path_obj, start_frame, end_frame,
+    def _apply_rig_animations(self, target_obj, armature_obj, path_obj, follow_path, start_frame, end_frame,
                              start_pose, end_pose, main_anim, start_blend_frames, end_blend_frames):
         """Apply poses and animations to the rig with speed matching"""
-        # Find the armature
-        armature_obj = self._find_armature(target_obj)
-        
         if not armature_obj:
             print(f"No armature found for {target_obj.name} - skipping pose/animation application")
             return
@@ -340,11 +323,10 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
         
         if use_speed_matched_animation and main_anim != "NONE":
             # Get the speed data from the constraint we just created
-            speed_data = self._extract_speed_data_from_constraint(target_obj, path_obj, start_frame, end_frame)
+            speed_data = self._extract_speed_data_from_constraint(target_obj, follow_path, start_frame, end_frame)
             
             if speed_data:
                 # Convert to segments
-                from .. import animation_library
                 segments = animation_library.convert_speed_data_to_segments(speed_data, start_frame, end_frame)
                 
                 if segments:
@@ -357,31 +339,17 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
                     else:
                         print("Speed-matched strips failed, falling back to regular NLA")
 
-    def _extract_speed_data_from_constraint(self, target_obj, path_obj, start_frame, end_frame):
+    def _extract_speed_data_from_constraint(self, target_obj, follow_path, start_frame, end_frame):
         """Extract speed data from the Follow Path constraint keyframes"""
         speed_data = {}
         
         try:
-            # Find the Follow Path constraint
-            constraint_name = f"FollowPath_{path_obj.name}"
-            follow_path = None
-            
-            for constraint in target_obj.constraints:
-                if constraint.name == constraint_name:
-                    follow_path = constraint
-                    break
-            
             if not follow_path or not target_obj.animation_data or not target_obj.animation_data.action:
                 return speed_data
             
             # Find the offset_factor fcurve
             action = target_obj.animation_data.action
-            offset_fcurve = None
-            
-            for fcurve in action.fcurves:
-                if fcurve.data_path == f'constraints["{constraint_name}"].offset_factor':
-                    offset_fcurve = fcurve
-                    break
+            offset_fcurve = action.fcurves.find(f'constraints["{follow_path.name}"].offset_factor')
             
             if not offset_fcurve:
                 return speed_data
@@ -412,31 +380,6 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
             print(f"Error extracting speed data: {e}")
             return speed_data
     
-    def _find_armature(self, target_obj):
-        """Find an armature object - either the target itself or its child"""
-        # Check if target is an armature
-        if target_obj.type == 'ARMATURE':
-            return target_obj
-        
-        # Check direct children for armature
-        for child in target_obj.children:
-            if child.type == 'ARMATURE':
-                return child
-        
-        # Check if target has an armature modifier pointing to an armature
-        if hasattr(target_obj, 'modifiers'):
-            for modifier in target_obj.modifiers:
-                if modifier.type == 'ARMATURE' and modifier.object:
-                    return modifier.object
-        
-        # Recursively check children's children (one level deep)
-        for child in target_obj.children:
-            for grandchild in child.children:
-                if grandchild.type == 'ARMATURE':
-                    return grandchild
-        
-        return None
-
     def _calculate_initial_rotation(self, path_obj):
         """Calculate the initial rotation to align with path direction at start"""
         try:
@@ -447,111 +390,188 @@ class ANIMPATH_OT_animate_object_along_path(Operator):
             spline = curve_data.splines[0]
             
             # Get start and a point slightly ahead to determine direction
-            start_pos = self._get_curve_position_at_start(spline)
-            direction_pos = self._get_curve_position_near_start(spline)
+            samplers = _SPLINE_START_SAMPLERS.get(spline.type)
+            if not samplers:
+                return _FALLBACK_ROT
+            start_pos = samplers[0](spline)
+            direction_pos = samplers[1](spline)
             
             if start_pos and direction_pos:
-                # Calculate direction vector
-                direction = direction_pos - start_pos
-                if direction.length > 0.001:  # Avoid zero-length vectors
-                    direction.normalize()
-                    
-                    # Calculate Z rotation (yaw) - rotation around Z-axis for flat paths
-                    # atan2(x, y) gives angle from Y-axis
-                    angle_z = math.atan2(direction.x, direction.y)
-                    
-                    # Apply the correction: negate and add pi (for flat paths only)
-                    angle_z = (-angle_z) + math.pi
-                    
-                    # For flat paths, no X or Y rotation needed
-                    return (0, 0, angle_z)
+                # Spline coordinates are local to the path object
+                direction = path_obj.matrix_world.to_3x3() @ (direction_pos - start_pos)
+                # Yaw only: the pitch and roll the evaluated Follow Path matrix would give on a
+                # sloped or tilted path are dropped on purpose so the target stays upright
+                return (0, 0, path_yaw(direction.x, direction.y, direction.z))
                 
             # Fallback rotation for flat paths
-            return (0, 0, math.pi)
+            return _FALLBACK_ROT
             
         except Exception as e:
             print(f"Error calculating initial rotation: {e}")
-            return (0, 0, math.pi)
-
-    def _get_curve_position_at_start(self, spline):
-        """Get the position at the very start of the curve"""
-        if spline.type == 'NURBS' and spline.points:
-            return Vector(spline.points[0].co[:3])
-        elif spline.type == 'BEZIER' and spline.bezier_points:
-            return spline.bezier_points[0].co
-        return None
+            return _FALLBACK_ROT
 
-    def _get_curve_position_near_start(self, spline):
-        """Get a position slightly ahead of the start to determine direction"""
-        if spline.type == 'NURBS' and len(spline.points) > 1:
-            # Use the second control point or interpolate slightly ahead
-            if len(spline.points) >= 2:
-                p0 = Vector(spline.points[0].co[:3])
-                p1 = Vector(spline.points[1].co[:3])
-                # Return a point 10% of the way to the second control point
-                return p0.lerp(p1, 0.1)
-        elif spline.type == 'BEZIER' and spline.bezier_points:
-            # Use the first control point's right handle or the second point
-            if len(spline.bezier_points) >= 2:
-                p0 = spline.bezier_points[0].co
-                handle_right = spline.bezier_points[0].handle_right
-                
-                # If the handle is in the same position as the point, use next point
-                if (handle_right - p0).length < 0.001:
-                    return spline.bezier_points[1].co
-                else:
-                    # Use the handle direction
-                    return p0.lerp(handle_right, 0.5)
-            elif len(spline.bezier_points) == 1:
-                # Single point, use the right handle
-                p0 = spline.bezier_points[0].co
-                handle_right = spline.bezier_points[0].handle_right
-                return handle_right
-        
-        return None
-    
-    def _get_control_point_position(self, path_obj, point_type):
-        """Helper to get control point position"""
-        point_name = path_obj.get(f"{point_type}_control_point")
-        if point_name:
-            point_obj = bpy.data.objects.get(point_name)
-            if point_obj:
-                return point_obj.location.copy()
+    def _calculate_final_rotation(self, path_obj):
+        """Calculate the rotation matching the path direction at its end"""
+        try:
+            curve_data = path_obj.data
+            if not curve_data.splines:
+                return _FALLBACK_ROT
+            
+            direction = _SPLINE_END_DIRECTIONS.get(curve_data.splines[0].type, _no_direction)(curve_data.splines[0])
+            if direction is None:
+                return _FALLBACK_ROT
+            
+            # Spline coordinates are local to the path object
+            direction = path_obj.matrix_world.to_3x3() @ direction
+            # Yaw only, like _calculate_initial_rotation: pitch and roll from the evaluated
+            # Follow Path matrix are dropped on purpose so the target stays upright
+            return (0, 0, path_yaw(direction.x, direction.y, direction.z))
+            
+        except Exception as e:
+            print(f"Error calculating final rotation: {e}")
+            return _FALLBACK_ROT
+
+    def _get_start_end_positions(self, path_obj, path_props):
+        """
+        Get (start, end) positions from the control points, stored data, or curve geometry.
+        Positions are plain (x, y, z) sequences; wrap in Vector where arithmetic is needed.
+        """
+        sp, ep = get_control_point_objects(path_obj)
+        start_pos = sp.location[:] if sp else None
+        end_pos = ep.location[:] if ep else None
         
         # Fallback to stored data
-        fallback_pos = path_obj.get(f"{point_type}_pos")
-        if fallback_pos:
-            return Vector(fallback_pos)
+        if start_pos is None:
+            fallback_pos = path_props.get("start_pos")
+            if fallback_pos:
+                start_pos = tuple(fallback_pos)
+        if end_pos is None:
+            fallback_pos = path_props.get("end_pos")
+            if fallback_pos:
+                end_pos = tuple(fallback_pos)
         
-        # Last resort: curve geometry
-        if point_type == "start":
-            return self._get_curve_start_position(path_obj)
-        elif point_type == "end":
-            return self._get_curve_end_position(path_obj)
+        # Last resort: curve geometry (first spline read once for both ends)
+        if start_pos is None or end_pos is None:
+            curve_start, curve_end = self._get_curve_endpoints(path_obj)
+            if start_pos is None:
+                start_pos = curve_start
+            if end_pos is None:
+                end_pos = curve_end
         
-        return None
+        return start_pos, end_pos
     
-    def _get_curve_start_position(self, curve_obj):
-        """Get start position from curve"""
+    def _get_curve_endpoints(self, curve_obj):
+        """Get (start, end) positions from the curve's first spline"""
         curve_data = curve_obj.data
         if curve_data.splines:
             spline = curve_data.splines[0]
             if spline.type == 'NURBS' and spline.points:
-                return Vector(spline.points[0].co[:3])
+                points = spline.points
+                point_count = len(points)
+                if point_count > _BULK_READ_MIN_POINTS:
+                    # Read all coordinates in one call instead of indexing through RNA
+                    coords = np.empty(point_count * 4, dtype=np.float32)
+                    points.foreach_get("co", coords)
+                    return Vector(coords[0:3]), Vector(coords[-4:-1])
+                return Vector(points[0].co[:3]), Vector(points[-1].co[:3])
             elif spline.type == 'BEZIER' and spline.bezier_points:
-                return spline.bezier_points[0].co
-        return None
+                bezier_points = spline.bezier_points
+                return bezier_points[0].co, bezier_points[-1].co
+        return None, None
+
+def _animate_path_eval_time(curve_data, frame_start=1, length=100):
+    """
+    Give the curve's eval_time the default linear animation, as the Follow Path
+    constraint's Animate Path operator does, without going through bpy.ops
+    (which needs the target selected and active and pushes an undo step).
+    """
+    anim_data = curve_data.animation_data or curve_data.animation_data_create()
+    if not anim_data.action:
+        anim_data.action = bpy.data.actions.new(name=f"{curve_data.name}Action")
     
-    def _get_curve_end_position(self, curve_obj):
-        """Get end position from curve"""
-        curve_data = curve_obj.data
-        if curve_data.splines:
-            spline = curve_data.splines[0]
-            if spline.type == 'NURBS' and spline.points:
-                return Vector(spline.points[-1].co[:3])
-            elif spline.type == 'BEZIER' and spline.bezier_points:
-                return spline.bezier_points[-1].co
+    fcurve = anim_data.action.fcurves.find("eval_time")
+    if fcurve is None:
+        fcurve = anim_data.action.fcurves.new("eval_time")
+    
+    # Leave existing path animation alone
+    if len(fcurve.keyframe_points) or len(fcurve.modifiers):
+        return
+    
+    # eval_time = slope * frame + intercept, 100 eval_time units per `length` frames
+    slope = 100.0 / length
+    generator = fcurve.modifiers.new('GENERATOR')
+    generator.coefficients = (-frame_start * slope, slope)
+
+def _nurbs_position_at_start(spline):
+    if spline.points:
+        return Vector(spline.points[0].co[:3])
+    return None
+
+def _nurbs_position_near_start(spline):
+    if len(spline.points) >= 2:
+        p0 = Vector(spline.points[0].co[:3])
+        p1 = Vector(spline.points[1].co[:3])
+        # Return a point 10% of the way to the second control point
+        return p0.lerp(p1, 0.1)
+    return None
+
+def _bezier_position_at_start(spline):
+    if spline.bezier_points:
+        return spline.bezier_points[0].co
+    return None
+
+def _bezier_position_near_start(spline):
+    bezier_points = spline.bezier_points
+    if len(bezier_points) >= 2:
+        # Use the first control point's right handle or the second point
+        p0 = bezier_points[0].co
+        handle_right = bezier_points[0].handle_right
+        
+        # If the handle is in the same position as the point, use next point
+        if (handle_right - p0).length < 0.001:
+            return bezier_points[1].co
+        else:
+            # Use the handle direction
+            return p0.lerp(handle_right, 0.5)
+    elif len(bezier_points) == 1:
+        # Single point, use the right handle
+        return bezier_points[0].handle_right
+    return None
+
+def _no_direction(spline):
+    return None
+
+def _nurbs_direction_at_end(spline):
+    points = spline.points
+    if len(points) >= 2:
+        return Vector(points[-1].co[:3]) - Vector(points[-2].co[:3])
+    return None
+
+def _bezier_direction_at_end(spline):
+    bezier_points = spline.bezier_points
+    if not bezier_points:
         return None
+    p_end = bezier_points[-1].co
+    handle_left = bezier_points[-1].handle_left
+    
+    # If the handle is in the same position as the point, use the previous point
+    if (p_end - handle_left).length >= 0.001:
+        return p_end - handle_left
+    if len(bezier_points) >= 2:
+        return p_end - bezier_points[-2].co
+    return None
+
+# Spline type -> direction of travel at the end of the spline
+_SPLINE_END_DIRECTIONS = {
+    'NURBS': _nurbs_direction_at_end,
+    'BEZIER': _bezier_direction_at_end,
+}
+
+# Spline type -> (start position sampler, near-start position sampler)
+_SPLINE_START_SAMPLERS = {
+    'NURBS': (_nurbs_position_at_start, _nurbs_position_near_start),
+    'BEZIER': (_bezier_position_at_start, _bezier_position_near_start),
+}
 
 # List of classes to register
 classes = [
@@ -560,23 +580,8 @@ classes = [
 
 def register():
     """Register animation operators"""
-    for cls in classes:
-        try:
-            bpy.utils.register_class(cls)
-        except ValueError as e:
-            if "already registered" in str(e):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    bpy.utils.register_class(cls)
-                except:
-                    print(f"Warning: Could not register class {cls.__name__}: {e}")
-            else:
-                print(f"Error registering class {cls.__name__}: {e}")
+    register_classes(classes)
 
 def unregister():
     """Unregister animation operators"""
-    for cls in reversed(classes):
-        try:
-            bpy.utils.unregister_class(cls)
-        except:
-            pass
\ No newline at end of file
+    unregister_classes(classes)
\ No newline at end of file
@@ -3,19 +3,208 @@ Utility functions for animation operators
 """
 
 import bpy
-import bmesh
-import math
-from mathutils import Vector
+import numpy as np
 
 #DEBUG
 import json
 import os
 
-def clear_selective_animation(target_obj, start_frame, end_frame, path_obj=None):
+try:
+    from ..math_kernels import speed_profile_frame_positions
+    from ..animation_library import record_nla_track, pop_recorded_nla_tracks
+except ImportError:
+    from math_kernels import speed_profile_frame_positions
+    from animation_library import record_nla_track, pop_recorded_nla_tracks
+
+# Print progress diagnostics from apply_speed_control and per-fcurve details from the cleanup helpers
+DEBUG = False
+
+def register_classes(classes):
+    """Register classes, first replacing any registered class of the same name (addon reload)"""
+    for cls in classes:
+        registered = getattr(bpy.types, cls.__name__, None)
+        if registered is not None:
+            bpy.utils.unregister_class(registered)
+        bpy.utils.register_class(cls)
+
+def unregister_classes(classes):
+    """Unregister classes in reverse order, skipping any that are not registered"""
+    for cls in reversed(classes):
+        registered = getattr(bpy.types, cls.__name__, None)
+        if registered is not None:
+            bpy.utils.unregister_class(registered)
+
+def get_control_point_objects(path_obj):
+    """Resolve a path's (start, end) control point objects in one pass, None for any that are missing"""
+    objs = bpy.data.objects
+    sp_name = path_obj.get("start_control_point")
+    ep_name = path_obj.get("end_control_point")
+    sp = objs.get(sp_name) if sp_name else None
+    ep = objs.get(ep_name) if ep_name else None
+    return sp, ep
+
+def clear_selection(context):
+    """Deselect only the currently selected objects (cheaper than bpy.ops.object.select_all)"""
+    for obj in list(context.selected_objects):
+        obj.select_set(False)
+
+# Cache of keyframe interpolation enum identifiers -> stored integer values
+_interpolation_values = {}
+
+def get_interpolation_value(interpolation):
+    """Get the integer value Blender stores for a keyframe interpolation mode (for foreach_set)"""
+    value = _interpolation_values.get(interpolation)
+    if value is None:
+        enum_items = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items
+        value = enum_items[interpolation].value
+        _interpolation_values[interpolation] = value
+    return value
+
+def set_constraint_keyframes(constraint, prop_name, points, interpolation='BEZIER'):
+    """
+    Write all keyframes for a constraint property in one batch.
+    Creates the fcurve directly and fills it with foreach_set instead of
+    resolving the RNA path through keyframe_insert once per point.
+    
+    points: list of (frame, value) tuples or an (N, 2) array, sorted by frame
+    Returns the created fcurve
+    """
+    owner = constraint.id_data
+    anim_data = owner.animation_data or owner.animation_data_create()
+    if not anim_data.action:
+        anim_data.action = bpy.data.actions.new(name=f"{owner.name}Action")
+    action = anim_data.action
+    
+    data_path = f'constraints["{constraint.name}"].{prop_name}'
+    fcurve = action.fcurves.find(data_path)
+    if fcurve:
+        action.fcurves.remove(fcurve)
+    fcurve = action.fcurves.new(data_path)
+    
+    # Typed buffers let foreach_set copy straight through the buffer protocol
+    co = np.asarray(points, dtype=np.float32).reshape(-1)
+    count = len(co) // 2
+    fcurve.keyframe_points.add(count)
+    fcurve.keyframe_points.foreach_set("co", co)
+    fcurve.keyframe_points.foreach_set("interpolation", np.full(count, get_interpolation_value(interpolation), dtype=np.int32))
+    fcurve.update()
+    
+    return fcurve
+
+def insert_keyframe_fast(obj, data_path, frame, values, group="Object Transforms", interpolation=None):
+    """
+    Key every channel of an object's vector property at one frame with
+    keyframe_points.insert(options={'FAST'}), which skips the per-insert
+    sort and handle recalculation. Call update_action_fcurves() once all
+    keys are in, before the animation is evaluated.
+    interpolation: optional mode for the new keys, otherwise the user preference default
+    """
+    anim_data = obj.animation_data or obj.animation_data_create()
+    if not anim_data.action:
+        anim_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    fcurves = anim_data.action.fcurves
+    
+    for index, value in enumerate(values):
+        fcurve = fcurves.find(data_path, index=index)
+        if fcurve is None:
+            fcurve = fcurves.new(data_path, index=index, action_group=group)
+        keyframe = fcurve.keyframe_points.insert(frame, value, options={'FAST'})
+        if interpolation:
+            keyframe.interpolation = interpolation
+
+# Removing more keyframes than this from one fcurve rebuilds it in bulk
+_BULK_REMOVE_MIN_KEYFRAMES = 8
+
+# Keyframe properties copied when rebuilding an fcurve: (name, values per key, dtype)
+_KEYFRAME_BULK_PROPS = (
+    ("co", 2, np.float32),
+    ("handle_left", 2, np.float32),
+    ("handle_right", 2, np.float32),
+    ("interpolation", 1, np.int32),
+    ("handle_left_type", 1, np.int32),
+    ("handle_right_type", 1, np.int32),
+    ("easing", 1, np.int32),
+    ("type", 1, np.int32),
+    ("amplitude", 1, np.float32),
+    ("back", 1, np.float32),
+    ("period", 1, np.float32),
+)
+
+def _index_fcurves(action):
+    """Map each data_path of an action to its fcurves (one per array index), in a single pass"""
+    fcurve_index = {}
+    for fcurve in action.fcurves:
+        fcurve_index.setdefault(fcurve.data_path, []).append(fcurve)
+    return fcurve_index
+
+def _keyframe_frames(fcurve):
+    """Frame of every keyframe on an fcurve, read with a single foreach_get"""
+    co = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+    fcurve.keyframe_points.foreach_get("co", co)
+    return co[0::2]
+
+def _keyframes_in_range(fcurve, start_frame, end_frame):
+    """Indices of the keyframes between start_frame and end_frame (inclusive)"""
+    # Curves entirely outside the window are skipped without reading their points
+    first_frame, last_frame = fcurve.range()
+    if last_frame < start_frame or first_frame > end_frame:
+        return np.empty(0, dtype=np.intp)
+    frames = _keyframe_frames(fcurve)
+    return np.flatnonzero((frames >= start_frame) & (frames <= end_frame))
+
+def _remove_keyframes(fcurve, indices):
+    """
+    Remove keyframes by ascending index. A few are removed one by one (last first
+    so earlier indices stay valid); larger batches rebuild the fcurve from the
+    surviving points with foreach_get/foreach_set instead of one remove per key.
+    """
+    keyframe_points = fcurve.keyframe_points
+    if len(indices) == len(keyframe_points):
+        keyframe_points.clear()
+        return
+    if len(indices) <= _BULK_REMOVE_MIN_KEYFRAMES:
+        for i in reversed(indices.tolist()):
+            keyframe_points.remove(keyframe_points[i])
+        return
+    
+    count = len(keyframe_points)
+    keep = np.ones(count, dtype=bool)
+    keep[indices] = False
+    
+    survivors = {}
+    for prop, width, dtype in _KEYFRAME_BULK_PROPS:
+        values = np.empty(count * width, dtype=dtype)
+        keyframe_points.foreach_get(prop, values)
+        survivors[prop] = values.reshape(count, width)[keep].ravel()
+    
+    keyframe_points.clear()
+    keyframe_points.add(int(keep.sum()))
+    for prop, values in survivors.items():
+        keyframe_points.foreach_set(prop, values)
+    fcurve.update()
+
+def _remove_empty_fcurves(action, fcurves):
+    """Remove the fcurves left without keyframes from the action and from the given index list"""
+    empty_fcurves = [fcurve for fcurve in fcurves if len(fcurve.keyframe_points) == 0]
+    for fcurve in empty_fcurves:
+        if DEBUG:
+            print(f"Removing empty fcurve: {fcurve.data_path}[{fcurve.array_index}]")
+        fcurves.remove(fcurve)
+        action.fcurves.remove(fcurve)
+
+def update_action_fcurves(obj):
+    """Sort keyframes and recalculate handles on every fcurve of an object's action"""
+    anim_data = obj.animation_data
+    if anim_data and anim_data.action:
+        for fcurve in anim_data.action.fcurves:
+            fcurve.update()
+
+def clear_selective_animation(target_obj, start_frame, end_frame, path_obj=None, armature_obj=None):
     """
     Clear animation data for path animations using a hybrid approach:
     - Clear ALL location/rotation keyframes in the frame range (range-based)
     - Use precise tracking for constraint cleanup (if path_obj provided)
+    armature_obj: the target's armature if the caller already ran find_armature
     """
     try:
         cleanup_performed = False
@@ -25,12 +214,11 @@ def clear_selective_animation(target_obj, start_frame, end_frame, path_obj=None)
             cleanup_performed |= _cleanup_hybrid_animation_data(target_obj, path_obj, start_frame, end_frame)
             
             # Also clean up any armature animation data
-            armature_obj = _find_armature(target_obj)
-            if armature_obj and armature_obj != target_obj:
-                cleanup_performed |= _cleanup_armature_path_animation(armature_obj, path_obj.name)
-            elif armature_obj == target_obj:
-                # If target is the armature, clean up NLA strips but preserve any follow path keyframes
-                cleanup_performed |= _cleanup_armature_path_animation(armature_obj, path_obj.name)
+            if armature_obj is None:
+                armature_obj = find_armature(target_obj)
+            # When the target is the armature itself this only touches NLA strips, so follow path keyframes are preserved
+            if armature_obj:
+                cleanup_performed |= _cleanup_armature_path_animation(armature_obj, path_obj.name, path_obj)
                 
             if cleanup_performed:
                 print(f"Cleared animation data for path: {path_obj.name} (range-based transforms + precise constraints)")
@@ -64,6 +252,7 @@ def _cleanup_hybrid_animation_data(target_obj, path_obj, start_frame, end_frame)
             return cleanup_performed
             
         action = target_obj.animation_data.action
+        fcurve_index = _index_fcurves(action)
         
         # Get stored tracking data
         tracking_key = f"keyframe_tracking_{target_obj.name}"
@@ -76,24 +265,21 @@ def _cleanup_hybrid_animation_data(target_obj, path_obj, start_frame, end_frame)
             for data_path in ["location", "rotation_euler", "rotation_quaternion"]:
                 frames_to_clear = keyframe_data.get(data_path, [])
                 if frames_to_clear:
-                    cleanup_performed |= _clear_keyframes_at_frames(action, data_path, frames_to_clear)
-                    print(f"Cleared {len(frames_to_clear)} tracked {data_path} keyframes: {frames_to_clear}")
+                    cleanup_performed |= _clear_keyframes_at_frames(action, fcurve_index, data_path, frames_to_clear)
+                    if DEBUG:
+                        print(f"Cleared {len(frames_to_clear)} tracked {data_path} keyframes: {frames_to_clear}")
             
             # 2. PRECISE CONSTRAINT CLEARING: Use stored tracking data for constraints
             constraint_data = keyframe_data.get("constraints", {})
             for constraint_name, constraint_props in constraint_data.items():
                 for prop_name, frames_to_clear in constraint_props.items():
                     constraint_data_path = f'constraints["{constraint_name}"].{prop_name}'
-                    cleanup_performed |= _clear_keyframes_at_frames(action, constraint_data_path, frames_to_clear)
+                    cleanup_performed |= _clear_keyframes_at_frames(action, fcurve_index, constraint_data_path, frames_to_clear)
             
             # Remove the constraint itself
             if constraint_data:
                 constraint_name = list(constraint_data.keys())[0]
-                constraint_to_remove = None
-                for constraint in target_obj.constraints:
-                    if constraint.name == constraint_name:
-                        constraint_to_remove = constraint
-                        break
+                constraint_to_remove = target_obj.constraints.get(constraint_name)
                 
                 if constraint_to_remove:
                     target_obj.constraints.remove(constraint_to_remove)
@@ -114,30 +300,20 @@ def _cleanup_hybrid_animation_data(target_obj, path_obj, start_frame, end_frame)
         transform_paths = ['location', 'rotation_euler', 'rotation_quaternion']
         
         for data_path in transform_paths:
-            fcurves_to_process = []
-            for fcurve in action.fcurves:
-                if fcurve.data_path == data_path:
-                    fcurves_to_process.append(fcurve)
+            fcurves = fcurve_index.get(data_path, [])
             
-            for fcurve in fcurves_to_process:
-                keyframes_to_remove = []
-                
+            for fcurve in fcurves:
                 # Find ANY remaining keyframes within the new frame range
-                for i, keyframe in enumerate(fcurve.keyframe_points):
-                    if start_frame <= keyframe.co[0] <= end_frame:
-                        keyframes_to_remove.append(i)
+                keyframes_to_remove = _keyframes_in_range(fcurve, start_frame, end_frame)
                 
-                # Remove keyframes in reverse order to maintain indices
-                if keyframes_to_remove:
-                    print(f"Safety net: removing {len(keyframes_to_remove)} additional {data_path} keyframes in range")
-                    for i in reversed(keyframes_to_remove):
-                        fcurve.keyframe_points.remove(fcurve.keyframe_points[i])
-                        cleanup_performed = True
-                
-                # If fcurve has no keyframes left, remove it entirely
-                if len(fcurve.keyframe_points) == 0:
-                    action.fcurves.remove(fcurve)
-                    print(f"Removed empty fcurve: {data_path}")
+                if len(keyframes_to_remove):
+                    if DEBUG:
+                        print(f"Safety net: removing {len(keyframes_to_remove)} additional {data_path} keyframes in range")
+                    _remove_keyframes(fcurve, keyframes_to_remove)
+                    cleanup_performed = True
+            
+            # If an fcurve has no keyframes left, remove it entirely
+            _remove_empty_fcurves(action, fcurves)
         
         # 4. CONSTRAINT FALLBACK: Remove constraints by name pattern if no tracking data handled them
         if not keyframe_data:
@@ -155,16 +331,18 @@ def _cleanup_hybrid_animation_data(target_obj, path_obj, start_frame, end_frame)
                 print(f"Removed constraint by name: {constraint.name}")
                 
             # Also clear any constraint keyframes by name pattern
-            fcurves_to_remove = []
-            for fcurve in action.fcurves:
-                if (fcurve.data_path.startswith('constraints[') and 
-                    f'"{constraint_name}"' in fcurve.data_path):
-                    fcurves_to_remove.append(fcurve)
+            constraint_prefix = f'constraints["{constraint_name}"]'
+            fcurves_to_remove = [
+                fcurve
+                for data_path, fcurves in fcurve_index.items() if data_path.startswith(constraint_prefix)
+                for fcurve in fcurves
+            ]
             
             for fcurve in fcurves_to_remove:
+                if DEBUG:
+                    print(f"Removing constraint fcurve: {fcurve.data_path}")
                 action.fcurves.remove(fcurve)
                 cleanup_performed = True
-                print(f"Removed constraint fcurve: {fcurve.data_path}")
         
         if cleanup_performed:
             print(f"Hybrid cleanup completed: precise tracking + safety net for range {start_frame}-{end_frame}")
@@ -192,6 +370,7 @@ def push_down_action_manual(obj, path_obj):
     if not anim_data.nla_tracks:
         track = anim_data.nla_tracks.new()
         track.name = f"LAA_{path_obj.name}_Motion"
+        record_nla_track(path_obj, obj, track)
     else:
         # Use the last track or create new one if needed
         track = anim_data.nla_tracks[-1]
@@ -202,6 +381,7 @@ def push_down_action_manual(obj, path_obj):
             if last_strip_end >= frame_start:
                 track = anim_data.nla_tracks.new()
                 track.name = f"LAA_{path_obj.name}_Motion.{len(anim_data.nla_tracks):03d}"
+                record_nla_track(path_obj, obj, track)
     
     # Create the strip
     strip = track.strips.new(
@@ -241,7 +421,9 @@ def store_keyframe_tracking_data(path_obj, target_obj, constraint_name, keyframe
         tracking_key = f"keyframe_tracking_{target_obj.name}"
         path_obj[tracking_key] = keyframe_data
         
-        print(f"Stored keyframe tracking data for {target_obj.name}:")
+        print(f"Stored keyframe tracking data for {target_obj.name}")
+        if not DEBUG:
+            return
         for data_path, frames in keyframe_data.items():
             if data_path == "constraints":
                 for constraint_name, constraint_data in frames.items():
@@ -273,27 +455,24 @@ def _cleanup_tracked_animation_data(target_obj, path_obj):
             return cleanup_performed
             
         action = target_obj.animation_data.action
+        fcurve_index = _index_fcurves(action)
         
         # Clean up transform keyframes (location, rotation)
         for data_path in ["location", "rotation_euler", "rotation_quaternion"]:
             frames_to_clear = keyframe_data.get(data_path, [])
             if frames_to_clear:
-                cleanup_performed |= _clear_keyframes_at_frames(action, data_path, frames_to_clear)
+                cleanup_performed |= _clear_keyframes_at_frames(action, fcurve_index, data_path, frames_to_clear)
         
         # Clean up constraint keyframes
         constraint_data = keyframe_data.get("constraints", {})
         for constraint_name, constraint_props in constraint_data.items():
             for prop_name, frames_to_clear in constraint_props.items():
                 constraint_data_path = f'constraints["{constraint_name}"].{prop_name}'
-                cleanup_performed |= _clear_keyframes_at_frames(action, constraint_data_path, frames_to_clear)
+                cleanup_performed |= _clear_keyframes_at_frames(action, fcurve_index, constraint_data_path, frames_to_clear)
         
         # Remove the constraint itself
         constraint_name = list(constraint_data.keys())[0] if constraint_data else f"FollowPath_{path_obj.name}"
-        constraint_to_remove = None
-        for constraint in target_obj.constraints:
-            if constraint.name == constraint_name:
-                constraint_to_remove = constraint
-                break
+        constraint_to_remove = target_obj.constraints.get(constraint_name)
         
         if constraint_to_remove:
             target_obj.constraints.remove(constraint_to_remove)
@@ -312,37 +491,38 @@ def _cleanup_tracked_animation_data(target_obj, path_obj):
     
     return cleanup_performed
 
-def _clear_keyframes_at_frames(action, data_path, frames_to_clear):
-    """Remove keyframes at specific frames for a given data path"""
+def _clear_keyframes_at_frames(action, fcurve_index, data_path, frames_to_clear):
+    """
+    Remove keyframes at specific frames for a given data path
+    fcurve_index: the action's fcurves by data path (_index_fcurves), kept current as fcurves are removed
+    """
     cleanup_performed = False
     
     try:
         # Find all fcurves for this data path
-        fcurves_to_process = []
-        for fcurve in action.fcurves:
-            if fcurve.data_path == data_path:
-                fcurves_to_process.append(fcurve)
+        fcurves = fcurve_index.get(data_path)
+        if not fcurves:
+            return cleanup_performed
         
-        for fcurve in fcurves_to_process:
-            keyframes_to_remove = []
-            
+        # Match on whole frames so keyframes sitting slightly off an integer frame still match
+        wanted_frames = frozenset(int(round(f)) for f in frames_to_clear)
+        wanted_array = np.fromiter(wanted_frames, dtype=np.int64, count=len(wanted_frames))
+        
+        for fcurve in fcurves:
             # Find keyframes at the specified frames
-            for i, keyframe in enumerate(fcurve.keyframe_points):
-                if keyframe.co[0] in frames_to_clear:
-                    keyframes_to_remove.append(i)
+            keyframe_frames = np.rint(_keyframe_frames(fcurve)).astype(np.int64)
+            keyframes_to_remove = np.flatnonzero(np.isin(keyframe_frames, wanted_array))
             
-            # Remove keyframes in reverse order to maintain indices
-            for i in reversed(keyframes_to_remove):
-                fcurve.keyframe_points.remove(fcurve.keyframe_points[i])
+            if len(keyframes_to_remove):
+                _remove_keyframes(fcurve, keyframes_to_remove)
                 cleanup_performed = True
-            
-            # If fcurve has no keyframes left, remove it entirely
-            if len(fcurve.keyframe_points) == 0:
-                action.fcurves.remove(fcurve)
-                print(f"Removed empty fcurve: {data_path}")
+        
+        # If an fcurve has no keyframes left, remove it entirely
+        _remove_empty_fcurves(action, fcurves)
         
         if cleanup_performed:
-            print(f"Cleared {len(frames_to_clear)} keyframes from {data_path}")
+            if DEBUG:
+                print(f"Cleared {len(frames_to_clear)} keyframes from {data_path}")
             
     except Exception as e:
         print(f"Error clearing keyframes for {data_path}: {e}")
@@ -360,31 +540,29 @@ def _cleanup_path_animation_data(target_obj, path_name):
             fcurves_to_remove = []
             
             # Find fcurves related to the specific Follow Path constraint
-            constraint_name = f"FollowPath_{path_name}"
+            constraint_prefix = f'constraints["FollowPath_{path_name}"]'
             
-            for fcurve in action.fcurves:
-                try:
-                    should_remove = False
-                    
-                    # Remove constraint-related keyframes for this specific path
-                    if (fcurve.data_path.startswith('constraints[') and 
-                        (f'"{constraint_name}"' in fcurve.data_path)):
+            # Snapshot the collection once; nothing is removed until the scan is done
+            for fcurve in list(action.fcurves):
+                should_remove = False
+                data_path = fcurve.data_path
+                
+                # Remove constraint-related keyframes for this specific path
+                if data_path.startswith(constraint_prefix):
+                    should_remove = True
+                    if DEBUG:
+                        print(f"Marking constraint fcurve for removal: {data_path}")
+                
+                # For location/rotation keyframes, check if they were likely created by path animation
+                elif data_path in ['location', 'rotation_euler', 'rotation_quaternion']:
+                    # Check if this fcurve looks like path animation
+                    if _is_likely_path_animation_fcurve(fcurve, target_obj, path_name):
                         should_remove = True
-                        print(f"Marking constraint fcurve for removal: {fcurve.data_path}")
-                    
-                    # For location/rotation keyframes, check if they were likely created by path animation
-                    elif fcurve.data_path in ['location', 'rotation_euler', 'rotation_quaternion']:
-                        # Check if this fcurve looks like path animation
-                        if _is_likely_path_animation_fcurve(fcurve, target_obj, path_name):
-                            should_remove = True
-                            print(f"Marking location/rotation fcurve for removal: {fcurve.data_path}[{fcurve.array_index}]")
-                    
-                    if should_remove:
-                        fcurves_to_remove.append(fcurve)
+                        if DEBUG:
+                            print(f"Marking location/rotation fcurve for removal: {data_path}[{fcurve.array_index}]")
                 
-                except (AttributeError, ReferenceError):
-                    # FCurve or its data may have been invalidated
-                    continue
+                if should_remove:
+                    fcurves_to_remove.append(fcurve)
             
             # Remove the identified fcurves
             for fcurve in fcurves_to_remove:
@@ -399,14 +577,8 @@ def _cleanup_path_animation_data(target_obj, path_name):
         constraints_to_remove = []
         if hasattr(target_obj, 'constraints'):
             constraint_name = f"FollowPath_{path_name}"
-            for constraint in target_obj.constraints:
-                try:
-                    if (constraint.type == 'FOLLOW_PATH' and 
-                        constraint.name == constraint_name):
-                        constraints_to_remove.append(constraint)
-                except (AttributeError, ReferenceError):
-                    # Constraint may have been invalidated
-                    continue
+            constraints_to_remove = [constraint for constraint in list(target_obj.constraints)
+                                     if constraint.type == 'FOLLOW_PATH' and constraint.name == constraint_name]
         
         for constraint in constraints_to_remove:
             try:
@@ -423,23 +595,27 @@ def _cleanup_path_animation_data(target_obj, path_name):
     
     return cleanup_performed
 
-def _cleanup_armature_path_animation(armature_obj, path_name):
-    """Clean up NLA strips and tracks created by a specific path"""
+def _cleanup_armature_path_animation(armature_obj, path_name, path_obj=None):
+    """
+    Clean up NLA strips and tracks created by a specific path.
+    Uses the track names recorded on path_obj when available, otherwise scans by name prefix.
+    """
     cleanup_performed = False
     
     try:
         if not armature_obj.animation_data:
             return False
         
+        nla_tracks = armature_obj.animation_data.nla_tracks
+        recorded_names = pop_recorded_nla_tracks(path_obj, armature_obj) if path_obj else None
+        
         # Remove NLA tracks created by this path
         tracks_to_remove = []
-        for track in armature_obj.animation_data.nla_tracks:
-            try:
-                if track.name.startswith(f"LAA_{path_name}"):
-                    tracks_to_remove.append(track)
-            except (AttributeError, ReferenceError):
-                # Track may have been invalidated
-                continue
+        if recorded_names is not None:
+            tracks_to_remove = [track for track in map(nla_tracks.get, recorded_names) if track]
+        else:
+            track_prefix = f"LAA_{path_name}"
+            tracks_to_remove = [track for track in list(nla_tracks) if track.name.startswith(track_prefix)]
         
         for track in tracks_to_remove:
             try:
@@ -462,67 +638,95 @@ def _is_likely_path_animation_fcurve(fcurve, target_obj, path_name):
     This is a heuristic approach since we can't always know for certain.
     """
     try:
-        # If there are very few keyframes, it might be path animation
-        # (path animations typically have start/end keyframes)
         keyframe_count = len(fcurve.keyframe_points)
+        if keyframe_count < 2:
+            return False
+        
+        # Read frames and values in one call (float64 keeps the exact differences of the stored floats)
+        co = np.empty(keyframe_count * 2, dtype=np.float32)
+        fcurve.keyframe_points.foreach_get("co", co)
+        co = co.astype(np.float64)
+        frames = co[0::2]
+        values = co[1::2]
         
+        # If there are very few keyframes, it might be path animation
+        # (path animations typically have start/end keyframes)
         if keyframe_count <= 4:  # Typical for path animations (start, end, maybe +1 frame)
-            # Check if keyframes align with typical path animation patterns
-            frames = [kf.co[0] for kf in fcurve.keyframe_points]
-            
-            # Look for patterns like consecutive frames at the end (typical of path animations)
-            consecutive_end_frames = 0
-            if len(frames) >= 2:
-                frames.sort()
-                for i in range(len(frames) - 1):
-                    if frames[i + 1] - frames[i] == 1:  # Consecutive frames
-                        consecutive_end_frames += 1
-            
-            # If we see consecutive frames (common in path animations), it's likely path-related
-            if consecutive_end_frames > 0:
+            # Consecutive frames (common at the end of path animations) mean it's likely path-related
+            if np.any(np.diff(np.sort(frames)) == 1):
                 return True
             
             # For location fcurves specifically, if there are exactly 2-3 keyframes, 
             # it's often from path animation
-            if fcurve.data_path == 'location' and 2 <= keyframe_count <= 3:
+            if fcurve.data_path == 'location' and keyframe_count <= 3:
                 return True
         
         # Additional check: if all keyframes have the same value (common for offset animations)
-        if keyframe_count >= 2:
-            values = [kf.co[1] for kf in fcurve.keyframe_points]
-            if len(set(values)) == 1:  # All values are the same
-                return True
-        
-        return False
+        return bool(np.all(values == values[0]))
         
     except Exception as e:
         print(f"Error checking if fcurve is path animation: {e}")
         return False
 
-def _find_armature(target_obj):
+# Target session_uid -> (object count, armature name) from the last find_armature scan
+_armature_cache = {}
+
+def find_armature(target_obj):
     """Find an armature object - either the target itself or its child"""
     # Check if target is an armature
     if target_obj.type == 'ARMATURE':
         return target_obj
     
+    # Reuse the last result while the object count is unchanged and the armature is still linked to the target
+    objs = bpy.data.objects
+    cached = _armature_cache.get(target_obj.session_uid)
+    if cached and cached[0] == len(objs):
+        armature_obj = objs.get(cached[1])
+        if armature_obj and _is_armature_of(armature_obj, target_obj):
+            return armature_obj
+    
+    armature_obj = _scan_for_armature(target_obj)
+    if armature_obj:
+        _armature_cache[target_obj.session_uid] = (len(objs), armature_obj.name)
+    else:
+        _armature_cache.pop(target_obj.session_uid, None)
+    return armature_obj
+
+def _is_armature_of(armature_obj, target_obj):
+    """Check that an armature is still a child, grandchild or modifier armature of the target"""
+    if armature_obj.type != 'ARMATURE':
+        return False
+    parent = armature_obj.parent
+    if parent is not None and (parent == target_obj or parent.parent == target_obj):
+        return True
+    return any(modifier.type == 'ARMATURE' and modifier.object == armature_obj
+               for modifier in target_obj.modifiers)
+
+def _scan_for_armature(target_obj):
+    """Search the scene for the target's armature (child, then modifier, then grandchild)"""
+    # One pass over all objects instead of walking .children (each access scans every object)
+    child_armature = None
+    grandchild_armature = None
+    for obj in bpy.data.objects:
+        if obj.type != 'ARMATURE' or obj.parent is None:
+            continue
+        if obj.parent == target_obj:
+            child_armature = obj
+            break
+        if grandchild_armature is None and obj.parent.parent == target_obj:
+            grandchild_armature = obj
+    
     # Check direct children for armature
-    for child in target_obj.children:
-        if child.type == 'ARMATURE':
-            return child
+    if child_armature:
+        return child_armature
     
     # Check if target has an armature modifier pointing to an armature
-    if hasattr(target_obj, 'modifiers'):
-        for modifier in target_obj.modifiers:
-            if modifier.type == 'ARMATURE' and modifier.object:
-                return modifier.object
-    
-    # Recursively check children's children (one level deep)
-    for child in target_obj.children:
-        for grandchild in child.children:
-            if grandchild.type == 'ARMATURE':
-                return grandchild
+    for modifier in target_obj.modifiers:
+        if modifier.type == 'ARMATURE' and modifier.object:
+            return modifier.object
     
-    return None
+    # Children's children (one level deep)
+    return grandchild_armature
 
 def _clear_animation_by_frame_range(target_obj, start_frame, end_frame):
     """
@@ -536,31 +740,21 @@ def _clear_animation_by_frame_range(target_obj, start_frame, end_frame):
         
         # Data paths we want to clear
         data_paths_to_clear = ['location', 'rotation_euler']
+        fcurve_index = _index_fcurves(action)
         
         for data_path in data_paths_to_clear:
-            # Find all fcurves for this data path (x, y, z components)
-            fcurves_to_process = []
-            for fcurve in action.fcurves:
-                if fcurve.data_path == data_path:
-                    fcurves_to_process.append(fcurve)
-            
-            # Remove keyframes in the specified range for each fcurve
-            for fcurve in fcurves_to_process:
-                keyframes_to_remove = []
-                
+            # Remove keyframes in the specified range for each fcurve (x, y, z components)
+            fcurves = fcurve_index.get(data_path, [])
+            for fcurve in fcurves:
                 # Find keyframes within the frame range
-                for i, keyframe in enumerate(fcurve.keyframe_points):
-                    if start_frame <= keyframe.co[0] <= end_frame:
-                        keyframes_to_remove.append(i)
+                keyframes_to_remove = _keyframes_in_range(fcurve, start_frame, end_frame)
                 
-                # Remove keyframes in reverse order to maintain indices
-                for i in reversed(keyframes_to_remove):
-                    fcurve.keyframe_points.remove(fcurve.keyframe_points[i])
+                if len(keyframes_to_remove):
+                    _remove_keyframes(fcurve, keyframes_to_remove)
                     cleanup_performed = True
-                
-                # If fcurve has no keyframes left, remove it entirely
-                if len(fcurve.keyframe_points) == 0:
-                    action.fcurves.remove(fcurve)
+            
+            # If an fcurve has no keyframes left, remove it entirely
+            _remove_empty_fcurves(action, fcurves)
         
         if cleanup_performed:
             print(f"Cleared location and rotation keyframes between frames {start_frame}-{end_frame}")
@@ -580,11 +774,7 @@ def _clear_animation_by_frame_range(target_obj, start_frame, end_frame):
                     influence_path = f'constraints["{constraint.name}"].influence'
                     
                     # Find the influence fcurve
-                    influence_fcurve = None
-                    for fcurve in action.fcurves:
-                        if fcurve.data_path == influence_path:
-                            influence_fcurve = fcurve
-                            break
+                    influence_fcurve = action.fcurves.find(influence_path)
                     
                     if influence_fcurve:
                         # Check if any keyframe in range has influence > 0
@@ -624,10 +814,9 @@ def get_constraint_keyframe_frames(constraint, data_path):
             action = constraint.id_data.animation_data.action
             constraint_path = f'constraints["{constraint.name}"].{data_path}'
             
-            for fcurve in action.fcurves:
-                if fcurve.data_path == constraint_path:
-                    keyframe_frames = [kf.co[0] for kf in fcurve.keyframe_points]
-                    break
+            fcurve = action.fcurves.find(constraint_path)
+            if fcurve:
+                keyframe_frames = [kf.co[0] for kf in fcurve.keyframe_points]
         
         return sorted(keyframe_frames)
         
@@ -641,16 +830,14 @@ def apply_speed_control(follow_path_constraint, curve_obj, start_frame, end_fram
                         curvature_threshold=0.001,
                         use_keyframe_reduction=True,
                         use_blend_speed=True,
-                        error_tolerance=0.01):
+                        error_tolerance=0.01,
+                        depsgraph=None):
     """
     Apply curvature-based speed control to a Follow Path constraint.
     Slows down on sharp curves, speeds up on straight sections.
+    depsgraph: evaluated depsgraph to sample the curve from; callers animating several paths can share one
     """
     try:
-        import bmesh
-        import mathutils
-        import math
-
         # Import the keyframe reduction module
         try:
             from .keyframe_reduction import reduce_keyframes_to_bezier, convert_to_blender_keyframes
@@ -662,191 +849,91 @@ def apply_speed_control(follow_path_constraint, curve_obj, start_frame, end_fram
         if total_frames <= 0:
             return False
 
-        # Get curve mesh representation for sampling
-        context = bpy.context
-        depsgraph = context.evaluated_depsgraph_get()
-        curve_eval = curve_obj.evaluated_get(depsgraph)
-
-        # Convert curve to mesh to sample the actual geometry
-        mesh = curve_eval.to_mesh()
-        if not mesh.vertices or len(mesh.vertices) < 3:
-            curve_eval.to_mesh_clear()
-            return False
-
-        # Increase resolution for sampling.
-        original_resolution = curve_obj.data.resolution_u
-        original_render_resolution = curve_obj.data.render_resolution_u
-
-        curve_obj.data.resolution_u = 64
-        curve_obj.data.render_resolution_u = 64
-
-        positions = []
-        mesh = curve_eval.to_mesh()
-        for v in mesh.vertices:
-            positions.append(curve_obj.matrix_world @ v.co)
-
-        curve_eval.to_mesh_clear()
-
-        # Calculate curvature at each point along the curve mesh
-        curvatures = []
-
-        step = 3
-        for i in range(step, len(positions) - step):
-            p1 = positions[i - step]
-            p2 = positions[i]
-            p3 = positions[i + step]
-
-            # Calculate vectors from current point to neighbors
-            v1 = (p1 - p2).normalized()  # Vector pointing backward
-            v2 = (p3 - p2).normalized()  # Vector pointing forward
-
-            # Calculate the angle between the vectors
-            # The dot product gives us cos(angle)
-            dot_product = v1.dot(v2)
-            # Clamp to avoid numerical errors with acos
-            dot_product = max(-1.0, min(1.0, dot_product))
+        # Increase resolution for sampling before evaluating, so the curve is tessellated only once
+        curve_data = curve_obj.data
+        original_resolution = curve_data.resolution_u
+        original_render_resolution = curve_data.render_resolution_u
 
-            # The angle between the vectors (in radians)
-            angle = math.acos(dot_product)
+        curve_data.resolution_u = 64
+        curve_data.render_resolution_u = 64
 
-            # Use deviation from 90° as curvature measure
-            turn_angle = math.pi - angle
-            turn_angle_degrees = math.degrees(turn_angle)
-
-            # Calculate how far this point deviates from 90° (straight)
-            deviation_from_90 = abs(turn_angle_degrees - 90.0)
-
-            # Apply threshold
-            min_deviation = 2.0
-            if deviation_from_90 < min_deviation:
-                curvature = 0.0
-            else:
-                # Normalize by max possible deviation (90°)
-                curvature = deviation_from_90 / 90.0
-
-            curvatures.append(curvature)
-
-        # Handle edge cases (first and last points)
-        if curvatures:
-            curvatures.insert(0, curvatures[0])
-            curvatures.append(curvatures[-1])
-        else:
-            curvatures = [0.0] * len(positions)
-
-        # Apply threshold to filter out very small curvatures
-        thresholded_curvatures = []
-        for curvature in curvatures:
-            if curvature < curvature_threshold:
-                thresholded_curvatures.append(0.0)
-            else:
-                thresholded_curvatures.append(curvature)
-
-        # Smooth curvatures to avoid jitter
-        smoothed_curvatures = []
-        window_size = 10
-        for i in range(len(thresholded_curvatures)):
-            start_idx = max(0, i - window_size // 2)
-            end_idx = min(len(thresholded_curvatures), i + window_size // 2 + 1)
-            avg_curvature = sum(thresholded_curvatures[start_idx:end_idx]) / (end_idx - start_idx)
-            smoothed_curvatures.append(avg_curvature)
-
-        # Convert curvatures to speeds
-        if smoothed_curvatures:
-            min_curvature = min(smoothed_curvatures)
-            max_curvature = max(smoothed_curvatures)
-
-            speeds = []
-            if max_curvature > min_curvature and max_curvature > 0:
-                for curvature in smoothed_curvatures:
-                    if curvature == 0.0:
-                        speed = 1.0  # Maximum speed for straight sections
-                    else:
-                        normalized = (curvature - min_curvature) / (max_curvature - min_curvature)
-                        speed = 1.0 - normalized  # High curvature = low speed
-                    speeds.append(speed)
-            else:
-                # All curvatures are below threshold or identical - use constant speed
-                speeds = [1.0] * len(smoothed_curvatures)
-        else:
-            speeds = [1.0]
-
-        # Calculate cumulative distances based on speeds
-        segment_distances = []
-        for i in range(len(speeds) - 1):
-            avg_speed = (speeds[i] + speeds[i + 1]) / 2.0
-            adjusted_speed = min_speed_factor + avg_speed * (max_speed_factor - min_speed_factor)
-            segment_distance = adjusted_speed  # Inverse of speed
-            segment_distances.append(segment_distance)
-
-        # Calculate cumulative distances
-        cumulative_distances = [0.0]
-        for dist in segment_distances:
-            cumulative_distances.append(cumulative_distances[-1] + dist)
-
-        # Normalize cumulative distances to 0-1 range
-        total_distance = cumulative_distances[-1]
-        if total_distance > 0:
-            normalized_positions = [d / total_distance for d in cumulative_distances]
-        else:
-            normalized_positions = [i / (len(cumulative_distances) - 1) for i in range(len(cumulative_distances))]
-
-        # Reset resolution
-        curve_obj.data.resolution_u = original_resolution
-        curve_obj.data.render_resolution_u = original_render_resolution
+        try:
+            # Get curve mesh representation for sampling
+            depsgraph = depsgraph or bpy.context.evaluated_depsgraph_get()
+            depsgraph.update()
+            curve_eval = curve_obj.evaluated_get(depsgraph)
 
-        # Collect all dense points instead of setting keyframes immediately
-        dense_points = []
-        print(f"Collecting dense animation data from frame {start_frame} to {end_frame}")
+            # Read all vertex coordinates in one call and transform them to world space in bulk
+            mesh = curve_eval.to_mesh()
+            try:
+                vertex_count = len(mesh.vertices)
+                if vertex_count < 3:
+                    return False
 
-        for frame_offset in range(total_frames + 1):
-            current_frame = start_frame + frame_offset
-            frame_progress = frame_offset / total_frames
+                co = np.empty(vertex_count * 3, dtype=np.float32)
+                mesh.vertices.foreach_get("co", co)
+            finally:
+                curve_eval.to_mesh_clear()
+        finally:
+            # Reset resolution
+            curve_data.resolution_u = original_resolution
+            curve_data.render_resolution_u = original_render_resolution
 
-            # Find the corresponding position along the path
-            position = frame_progress
+        # Transform to world space one component at a time on strided x/y/z views of the flat buffer
+        m = np.array(curve_obj.matrix_world, dtype=np.float64)
+        x, y, z = co[0::3], co[1::3], co[2::3]
+        positions = np.empty((vertex_count, 3), dtype=np.float64)
+        positions[:, 0] = m[0, 0] * x + m[0, 1] * y + m[0, 2] * z + m[0, 3]
+        positions[:, 1] = m[1, 0] * x + m[1, 1] * y + m[1, 2] * z + m[1, 3]
+        positions[:, 2] = m[2, 0] * x + m[2, 1] * y + m[2, 2] * z + m[2, 3]
 
-            # Interpolate between normalized positions
-            for i in range(len(normalized_positions) - 1):
-                t1 = i / (len(normalized_positions) - 1)
-                t2 = (i + 1) / (len(normalized_positions) - 1)
+        # Curvature -> speed -> per-frame path position (fused numba kernel when available)
+        if DEBUG:
+            print(f"Collecting dense animation data from frame {start_frame} to {end_frame}")
 
-                if t1 <= frame_progress <= t2:
-                    # Linear interpolation
-                    local_t = (frame_progress - t1) / (t2 - t1) if t2 > t1 else 0
-                    position = normalized_positions[i] + local_t * (normalized_positions[i + 1] - normalized_positions[i])
-                    break
+        frame_positions = speed_profile_frame_positions(positions, total_frames, curvature_threshold,
+                                                        min_speed_factor, max_speed_factor)
 
-            # Ensure position stays within bounds
-            position = max(0.0, min(1.0, position))
+        if frame_positions is None:
+            # Uniform speed profile (e.g. a straight path): the position is linear in the frame,
+            # so two linear keys describe the motion exactly
+            if DEBUG:
+                print("Uniform speed profile, using linear offset keyframes")
+            set_constraint_keyframes(follow_path_constraint, "offset_factor",
+                                     [(start_frame, 0.0), (end_frame, 1.0)], interpolation='LINEAR')
+            return True
 
-            # Store the point instead of setting keyframe
-            dense_points.append((current_frame, position))
+        frames = range(start_frame, end_frame + 1)
+        dense_points = list(zip(frames, frame_positions.tolist()))
 
-        print(f"Collected {len(dense_points)} dense points")
+        if DEBUG:
+            print(f"Collected {len(dense_points)} dense points")
 
         final_keyframes = []
 
         # Apply keyframe reduction
         if use_keyframe_reduction and len(dense_points) > 10:  # Only reduce if we have enough points
-            print("Applying keyframe reduction algorithm...")
+            if DEBUG:
+                print("Applying keyframe reduction algorithm...")
             reduced_keyframes = reduce_keyframes_to_bezier(dense_points, error_tolerance)
 
             # Apply the reduced keyframes to Blender
             convert_to_blender_keyframes(reduced_keyframes, follow_path_constraint, "offset_factor")
 
-            print(f"Reduced from {len(dense_points)} to {len(reduced_keyframes)} keyframes with Bezier interpolation")
+            if DEBUG:
+                print(f"Reduced from {len(dense_points)} to {len(reduced_keyframes)} keyframes with Bezier interpolation")
 
             final_keyframes = reduced_keyframes
         else:
-            # Fallback: Set keyframes for every frame (original method)
-            print("Using dense keyframes (reduction disabled or insufficient points)")
-            for frame, position in dense_points:
-                follow_path_constraint.offset_factor = position
-                follow_path_constraint.keyframe_insert(data_path="offset_factor", frame=frame)
+            # Fallback: Set keyframes for every frame, written to the fcurve in one batch
+            if DEBUG:
+                print("Using dense keyframes (reduction disabled or insufficient points)")
+            set_constraint_keyframes(follow_path_constraint, "offset_factor", dense_points, interpolation='LINEAR')
 
             final_keyframes = dense_points
 
-        print("Speed control applied successfully!")
+        if DEBUG:
+            print("Speed control applied successfully!")
 
         '''animation_data = {
             "start_frame": start_frame,
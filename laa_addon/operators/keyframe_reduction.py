@@ -4,11 +4,26 @@ Takes dense per-frame data and reduces it to the minimum number of keyframes nee
 to approximate the same curve within a given error tolerance.
 """
 
+import bisect
+import heapq
+import itertools
 import math
+import numpy as np
+from dataclasses import dataclass
 from typing import List, Tuple, Dict, Any
 
+try:
+    from ..math_kernels import njit, NUMBA_AVAILABLE
+except ImportError:
+    from math_kernels import njit, NUMBA_AVAILABLE
+
+# Print per-step diagnostics (critical points, handles, refinement progress)
+DEBUG = False
+
 class KeyframeData:
     """Represents a keyframe with position, time, and Bezier handles"""
+    __slots__ = ('frame', 'value', 'handle_left', 'handle_right', 'interpolation')
+    
     def __init__(self, frame: float, value: float):
         self.frame = frame
         self.value = value
@@ -19,6 +34,63 @@ class KeyframeData:
     def __repr__(self):
         return f"KeyframeData(frame={self.frame}, value={self.value:.4f})"
 
+@dataclass
+class KeyframeArray:
+    """
+    Struct-of-arrays form of a sorted keyframe list used inside the reduction.
+    Handles are offsets relative to their keyframe, NaN where a keyframe has no handle.
+    """
+    frames: np.ndarray
+    values: np.ndarray
+    handle_left_x: np.ndarray
+    handle_left_y: np.ndarray
+    handle_right_x: np.ndarray
+    handle_right_y: np.ndarray
+    
+    @classmethod
+    def from_points(cls, frames, values) -> 'KeyframeArray':
+        """Keyframes at the given frames and values, without handles"""
+        frames = np.array(frames, dtype=np.float64)
+        no_handles = np.full(len(frames), np.nan)
+        return cls(frames, np.array(values, dtype=np.float64),
+                   no_handles.copy(), no_handles.copy(), no_handles.copy(), no_handles.copy())
+    
+    @classmethod
+    def from_objects(cls, keyframes: List[KeyframeData]) -> 'KeyframeArray':
+        """Convert a list of KeyframeData objects"""
+        keyframe_array = cls.from_points([kf.frame for kf in keyframes], [kf.value for kf in keyframes])
+        for i, kf in enumerate(keyframes):
+            if kf.handle_left:
+                keyframe_array.handle_left_x[i], keyframe_array.handle_left_y[i] = kf.handle_left
+            if kf.handle_right:
+                keyframe_array.handle_right_x[i], keyframe_array.handle_right_y[i] = kf.handle_right
+        return keyframe_array
+    
+    def to_objects(self) -> List[KeyframeData]:
+        """Convert to a list of KeyframeData objects (e.g. for convert_to_blender_keyframes)"""
+        keyframes = []
+        for frame, value, left_x, left_y, right_x, right_y in zip(
+                self.frames.tolist(), self.values.tolist(),
+                self.handle_left_x.tolist(), self.handle_left_y.tolist(),
+                self.handle_right_x.tolist(), self.handle_right_y.tolist()):
+            keyframe = KeyframeData(frame, value)
+            if not math.isnan(left_x):
+                keyframe.handle_left = (left_x, left_y)
+            if not math.isnan(right_x):
+                keyframe.handle_right = (right_x, right_y)
+            keyframes.append(keyframe)
+        return keyframes
+    
+    def insert(self, frame: float, value: float) -> 'KeyframeArray':
+        """Return a copy with a handle-less keyframe inserted after any keyframes at or before frame"""
+        index = int(np.searchsorted(self.frames, frame, side='right'))
+        return KeyframeArray(np.insert(self.frames, index, frame), np.insert(self.values, index, value),
+                             np.insert(self.handle_left_x, index, np.nan), np.insert(self.handle_left_y, index, np.nan),
+                             np.insert(self.handle_right_x, index, np.nan), np.insert(self.handle_right_y, index, np.nan))
+    
+    def __len__(self):
+        return len(self.frames)
+
 def reduce_keyframes_to_bezier(dense_points: List[Tuple[float, float]], 
                               error_tolerance: float = 0.01,
                               max_iterations: int = 10) -> List[KeyframeData]:
@@ -36,35 +108,42 @@ def reduce_keyframes_to_bezier(dense_points: List[Tuple[float, float]],
     if len(dense_points) < 2:
         return [KeyframeData(frame, value) for frame, value in dense_points]
     
-    print(f"Starting keyframe reduction: {len(dense_points)} points -> minimal keyframes")
-    print(f"Error tolerance: {error_tolerance}")
+    # Convert once; every step below works on the same contiguous (N, 2) array
+    points = np.ascontiguousarray(dense_points, dtype=np.float64)
+    
+    if DEBUG:
+        print(f"Starting keyframe reduction: {len(dense_points)} points -> minimal keyframes")
+        print(f"Error tolerance: {error_tolerance}")
     
     # Step 1: Find critical points (peaks, valleys, inflection points)
-    critical_indices = find_critical_points(dense_points)
-    print(f"Found {len(critical_indices)} critical points: {critical_indices}")
+    critical_indices = find_critical_points(points)
+    if DEBUG:
+        print(f"Found {len(critical_indices)} critical points: {critical_indices}")
     
     # Step 2: Apply Douglas-Peucker algorithm for initial reduction
-    reduced_indices = douglas_peucker_reduce(dense_points, error_tolerance)
-    print(f"Douglas-Peucker reduced to {len(reduced_indices)} points: {reduced_indices}")
+    reduced_indices = douglas_peucker_reduce(points, error_tolerance)
+    if DEBUG:
+        print(f"Douglas-Peucker reduced to {len(reduced_indices)} points: {reduced_indices}")
     
     # Step 3: Combine critical points with reduced points
     combined_indices = sorted(set(critical_indices + reduced_indices))
-    print(f"Combined keyframe indices: {combined_indices}")
+    if DEBUG:
+        print(f"Combined keyframe indices: {combined_indices}")
     
     # Step 4: Create initial keyframes
-    initial_keyframes = [KeyframeData(dense_points[i][0], dense_points[i][1]) 
-                        for i in combined_indices]
+    initial_keyframes = KeyframeArray.from_points(points[combined_indices, 0], points[combined_indices, 1])
     
     # Step 5: Calculate Bezier handles for the keyframes
-    keyframes_with_handles = calculate_bezier_handles(initial_keyframes, dense_points)
+    keyframes_with_handles = calculate_bezier_handles(initial_keyframes)
     
     # Step 6: Iterative refinement to improve accuracy
-    final_keyframes = iterative_refinement(keyframes_with_handles, dense_points, 
-                                         error_tolerance, max_iterations)
+    final_keyframes = iterative_refinement(keyframes_with_handles, points, 
+                                         error_tolerance, max_iterations).to_objects()
     
-    print(f"Final result: {len(final_keyframes)} keyframes")
-    for i, kf in enumerate(final_keyframes):
-        print(f"  {i}: frame {kf.frame}, value {kf.value:.4f}")
+    print(f"Keyframe reduction: {len(dense_points)} points -> {len(final_keyframes)} keyframes")
+    if DEBUG:
+        for i, kf in enumerate(final_keyframes):
+            print(f"  {i}: frame {kf.frame}, value {kf.value:.4f}")
     
     return final_keyframes
 
@@ -76,360 +155,299 @@ def find_critical_points(points: List[Tuple[float, float]]) -> List[int]:
     if len(points) < 3:
         return [0, len(points) - 1] if len(points) > 1 else [0]
     
-    critical_indices = [0]  # Always include start point
-    
-    # Calculate first and second derivatives (approximate)
-    first_derivatives = []
-    second_derivatives = []
+    pts = np.asarray(points, dtype=np.float64)
     
-    # First derivative (slope between adjacent points)
-    for i in range(len(points) - 1):
-        dx = points[i + 1][0] - points[i][0]
-        dy = points[i + 1][1] - points[i][1]
-        slope = dy / dx if dx != 0 else 0
-        first_derivatives.append(slope)
+    # First derivative (slope between adjacent points, 0 where frames coincide)
+    dx = np.diff(pts[:, 0])
+    dy = np.diff(pts[:, 1])
+    first_derivatives = np.divide(dy, dx, out=np.zeros_like(dy), where=dx != 0)
     
     # Second derivative (change in slope)
-    for i in range(len(first_derivatives) - 1):
-        d_slope = first_derivatives[i + 1] - first_derivatives[i]
-        second_derivatives.append(d_slope)
+    second_derivatives = np.diff(first_derivatives)
     
     # Find peaks and valleys (where first derivative changes sign)
-    for i in range(1, len(first_derivatives)):
-        prev_slope = first_derivatives[i - 1]
-        curr_slope = first_derivatives[i]
-        
-        # Sign change indicates peak or valley
-        if (prev_slope > 0 and curr_slope < 0) or (prev_slope < 0 and curr_slope > 0):
-            critical_indices.append(i)
+    slope_signs = np.sign(first_derivatives)
+    peak_indices = np.flatnonzero(slope_signs[:-1] * slope_signs[1:] < 0) + 1
+    if DEBUG:
+        for i in peak_indices:
             print(f"Found peak/valley at point {i} (frame {points[i][0]})")
     
     # Find inflection points (where second derivative changes sign significantly)
     inflection_threshold = 0.001  # Minimum change to consider significant
-    for i in range(1, len(second_derivatives)):
-        prev_accel = second_derivatives[i - 1]
-        curr_accel = second_derivatives[i]
-        
-        # Significant change in acceleration direction
-        if abs(prev_accel - curr_accel) > inflection_threshold:
-            if (prev_accel > 0 and curr_accel < 0) or (prev_accel < 0 and curr_accel > 0):
-                critical_indices.append(i + 1)  # +1 because second derivative is offset
-                print(f"Found inflection point at point {i + 1} (frame {points[i + 1][0]})")
-    
-    critical_indices.append(len(points) - 1)  # Always include end point
-    
-    # Remove duplicates and sort
-    critical_indices = sorted(set(critical_indices))
-    
-    # Ensure we don't have indices out of bounds
-    critical_indices = [i for i in critical_indices if 0 <= i < len(points)]
-    
-    return critical_indices
+    prev_accel = second_derivatives[:-1]
+    curr_accel = second_derivatives[1:]
+    inflection_mask = (np.abs(prev_accel - curr_accel) > inflection_threshold) & (np.sign(prev_accel) * np.sign(curr_accel) < 0)
+    inflection_indices = np.flatnonzero(inflection_mask) + 2  # +1 for the loop offset, +1 because second derivative is offset
+    if DEBUG:
+        for i in inflection_indices:
+            print(f"Found inflection point at point {i} (frame {points[i][0]})")
+    
+    # Always include start and end points; np.unique removes duplicates and sorts
+    critical_indices = np.unique(np.concatenate(([0, len(points) - 1], peak_indices, inflection_indices)))
+    
+    return critical_indices.tolist()
 
 def douglas_peucker_reduce(points: List[Tuple[float, float]], tolerance: float) -> List[int]:
     """
     Apply Douglas-Peucker algorithm to reduce the number of points while maintaining shape.
     Returns indices of points to keep.
     """
-    def perpendicular_distance(point, line_start, line_end):
-        """Calculate perpendicular distance from point to line segment"""
-        x0, y0 = point
-        x1, y1 = line_start
-        x2, y2 = line_end
+    if len(points) < 2:
+        return list(range(len(points)))
+    
+    pts = np.asarray(points, dtype=np.float64)
+    xs = pts[:, 0]
+    ys = pts[:, 1]
+    
+    # Only the ordering of distances and the tolerance test matter, so work with squared values throughout
+    tolerance_sq = tolerance * tolerance
+    
+    if NUMBA_AVAILABLE:
+        return np.flatnonzero(_dp_mask(np.ascontiguousarray(xs), np.ascontiguousarray(ys), tolerance_sq)).tolist()
+    
+    # Iterative Douglas-Peucker: an explicit stack of (start, end) spans and a keep mask,
+    # so long dense curves can't hit the recursion limit
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    
+    while stack:
+        start_idx, end_idx = stack.pop()
+        if end_idx <= start_idx + 1:
+            continue
+        
+        x1, y1 = xs[start_idx], ys[start_idx]
+        x2, y2 = xs[end_idx], ys[end_idx]
+        seg_x = xs[start_idx + 1:end_idx]
+        seg_y = ys[start_idx + 1:end_idx]
         
-        # If line segment has zero length, return distance to start point
+        # Squared perpendicular distance numerators for every point in the span at once (cross product formula);
+        # the denominator is constant per span, so compare against tolerance² * denominator² instead of dividing
         if x1 == x2 and y1 == y2:
-            return math.sqrt((x0 - x1)**2 + (y0 - y1)**2)
+            # Zero-length segment, use the distance to the start point
+            numerators_sq = (seg_x - x1)**2 + (seg_y - y1)**2
+            denominator_sq = 1.0
+        else:
+            numerators_sq = np.square((y2 - y1) * seg_x - (x2 - x1) * seg_y + x2 * y1 - y2 * x1)
+            denominator_sq = (y2 - y1)**2 + (x2 - x1)**2
         
-        # Calculate perpendicular distance using cross product formula
-        numerator = abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1)
-        denominator = math.sqrt((y2 - y1)**2 + (x2 - x1)**2)
+        # Find the point with maximum distance from line segment
+        max_offset = int(np.argmax(numerators_sq))
+        max_index = start_idx + 1 + max_offset
         
-        return numerator / denominator if denominator > 0 else 0
+        # If max distance is greater than tolerance, keep that point and simplify both sides of it
+        if numerators_sq[max_offset] > tolerance_sq * denominator_sq:
+            keep[max_index] = True
+            stack.append((start_idx, max_index))
+            stack.append((max_index, end_idx))
     
-    def douglas_peucker_recursive(start_idx: int, end_idx: int) -> List[int]:
-        """Recursive implementation of Douglas-Peucker"""
+    return [i for i, kept in enumerate(keep) if kept]
+
+@njit(cache=True)
+def _dp_mask(xs, ys, tolerance_sq):
+    """Compiled Douglas-Peucker pass for douglas_peucker_reduce, returns a keep mask over the points"""
+    n = xs.shape[0]
+    keep = np.zeros(n, dtype=np.bool_)
+    keep[0] = True
+    keep[n - 1] = True
+    
+    # Flat stack of (start, end) pairs; at most one pending span per kept point
+    stack = np.empty(2 * n + 2, dtype=np.int64)
+    stack[0] = 0
+    stack[1] = n - 1
+    top = 2
+    
+    while top > 0:
+        top -= 2
+        start_idx = stack[top]
+        end_idx = stack[top + 1]
         if end_idx <= start_idx + 1:
-            return [start_idx, end_idx]
-        
-        # Find the point with maximum distance from line segment
-        max_distance = 0
-        max_index = start_idx
+            continue
         
-        line_start = points[start_idx]
-        line_end = points[end_idx]
+        x1 = xs[start_idx]
+        y1 = ys[start_idx]
+        x2 = xs[end_idx]
+        y2 = ys[end_idx]
+        zero_length = x1 == x2 and y1 == y2
+        denominator_sq = 1.0 if zero_length else (y2 - y1)**2 + (x2 - x1)**2
         
+        # Farthest point from the segment (first one on ties), by squared distance numerator
+        max_numerator_sq = -1.0
+        max_index = start_idx
         for i in range(start_idx + 1, end_idx):
-            distance = perpendicular_distance(points[i], line_start, line_end)
-            if distance > max_distance:
-                max_distance = distance
+            if zero_length:
+                numerator_sq = (xs[i] - x1)**2 + (ys[i] - y1)**2
+            else:
+                numerator_sq = ((y2 - y1) * xs[i] - (x2 - x1) * ys[i] + x2 * y1 - y2 * x1)**2
+            if numerator_sq > max_numerator_sq:
+                max_numerator_sq = numerator_sq
                 max_index = i
         
-        # If max distance is greater than tolerance, recursively simplify
-        if max_distance > tolerance:
-            # Recursively simplify before and after the max point
-            left_points = douglas_peucker_recursive(start_idx, max_index)
-            right_points = douglas_peucker_recursive(max_index, end_idx)
-            
-            # Combine results (remove duplicate max_index)
-            return left_points[:-1] + right_points
-        else:
-            # Max distance is within tolerance, keep only endpoints
-            return [start_idx, end_idx]
-    
-    if len(points) < 2:
-        return list(range(len(points)))
-    
-    result_indices = douglas_peucker_recursive(0, len(points) - 1)
-    return sorted(set(result_indices))
+        if max_numerator_sq > tolerance_sq * denominator_sq:
+            keep[max_index] = True
+            stack[top] = start_idx
+            stack[top + 1] = max_index
+            stack[top + 2] = max_index
+            stack[top + 3] = end_idx
+            top += 4
+    
+    return keep
 
-def calculate_bezier_handles(keyframes: List[KeyframeData], 
-                           original_points: List[Tuple[float, float]]) -> List[KeyframeData]:
+def calculate_bezier_handles(keyframes: KeyframeArray) -> KeyframeArray:
     """
     Calculate appropriate Bezier handles for each keyframe to create smooth curves.
     """
     if len(keyframes) < 2:
         return keyframes
     
-    print(f"Calculating Bezier handles for {len(keyframes)} keyframes")
-    
-    # Create a mapping from frame to original point for quick lookup
-    frame_to_point = {frame: (frame, value) for frame, value in original_points}
-    
-    for i, keyframe in enumerate(keyframes):
-        # Calculate tangent direction and handle lengths
-        prev_kf = keyframes[i - 1] if i > 0 else None
-        next_kf = keyframes[i + 1] if i < len(keyframes) - 1 else None
-        
-        # Calculate tangent based on neighboring keyframes
-        if prev_kf and next_kf:
-            # Interior keyframe - use slope between neighbors
-            dx = next_kf.frame - prev_kf.frame
-            dy = next_kf.value - prev_kf.value
-            tangent_slope = dy / dx if dx != 0 else 0
-        elif next_kf:
-            # First keyframe - use slope to next
-            dx = next_kf.frame - keyframe.frame
-            dy = next_kf.value - keyframe.value
-            tangent_slope = dy / dx if dx != 0 else 0
-        elif prev_kf:
-            # Last keyframe - use slope from previous
-            dx = keyframe.frame - prev_kf.frame
-            dy = keyframe.value - prev_kf.value
-            tangent_slope = dy / dx if dx != 0 else 0
-        else:
-            # Single keyframe
-            tangent_slope = 0
-        
-        # Calculate handle lengths (typically 1/3 of the distance to neighbors)
-        if prev_kf:
-            left_length = (keyframe.frame - prev_kf.frame) / 3.0
-            keyframe.handle_left = (-left_length, -left_length * tangent_slope)
-        
-        if next_kf:
-            right_length = (next_kf.frame - keyframe.frame) / 3.0
-            keyframe.handle_right = (right_length, right_length * tangent_slope)
-        
-        print(f"Keyframe {i} (frame {keyframe.frame}): "
-              f"left_handle={keyframe.handle_left}, right_handle={keyframe.handle_right}")
+    if DEBUG:
+        print(f"Calculating Bezier handles for {len(keyframes)} keyframes")
+    
+    frames = keyframes.frames
+    values = keyframes.values
+    count = len(frames)
+    
+    # Calculate tangent based on neighboring keyframes: interior keyframes use the slope between
+    # their neighbours, the first and last use the slope to the next / from the previous keyframe
+    indices = np.arange(count)
+    prev_indices = np.maximum(indices - 1, 0)
+    next_indices = np.minimum(indices + 1, count - 1)
+    dx = frames[next_indices] - frames[prev_indices]
+    dy = values[next_indices] - values[prev_indices]
+    tangent_slopes = np.divide(dy, dx, out=np.zeros_like(dy), where=dx != 0)
+    
+    # Calculate handle lengths (typically 1/3 of the distance to neighbors);
+    # the first keyframe has no left handle and the last no right handle
+    handle_lengths = np.diff(frames) / 3.0
+    keyframes.handle_left_x[0] = keyframes.handle_left_y[0] = np.nan
+    keyframes.handle_left_x[1:] = -handle_lengths
+    keyframes.handle_left_y[1:] = -handle_lengths * tangent_slopes[1:]
+    keyframes.handle_right_x[:-1] = handle_lengths
+    keyframes.handle_right_y[:-1] = handle_lengths * tangent_slopes[:-1]
+    keyframes.handle_right_x[-1] = keyframes.handle_right_y[-1] = np.nan
+    
+    if DEBUG:
+        for i, keyframe in enumerate(keyframes.to_objects()):
+            print(f"Keyframe {i} (frame {keyframe.frame}): "
+                  f"left_handle={keyframe.handle_left}, right_handle={keyframe.handle_right}")
     
     return keyframes
 
-def evaluate_bezier_curve(keyframes: List[KeyframeData], 
-                         start_frame: float, end_frame: float, 
-                         num_samples: int = 100) -> List[Tuple[float, float]]:
-    """
-    Evaluate the Bezier curve defined by keyframes at regular intervals.
-    Returns sampled points for comparison with original data.
-    """
-    if len(keyframes) < 2:
-        return [(kf.frame, kf.value) for kf in keyframes]
-    
-    sampled_points = []
-    frame_step = (end_frame - start_frame) / (num_samples - 1) if num_samples > 1 else 0
-    
-    for i in range(num_samples):
-        sample_frame = start_frame + i * frame_step
-        
-        # Find the segment containing this frame
-        segment_start = None
-        segment_end = None
-        
-        for j in range(len(keyframes) - 1):
-            if keyframes[j].frame <= sample_frame <= keyframes[j + 1].frame:
-                segment_start = keyframes[j]
-                segment_end = keyframes[j + 1]
-                break
-        
-        if segment_start and segment_end:
-            # Interpolate using Bezier curve
-            t = ((sample_frame - segment_start.frame) / 
-                 (segment_end.frame - segment_start.frame) if 
-                 segment_end.frame != segment_start.frame else 0)
-            
-            # Cubic Bezier interpolation
-            value = evaluate_cubic_bezier(
-                segment_start, segment_end, t
-            )
-            sampled_points.append((sample_frame, value))
-        elif sample_frame <= keyframes[0].frame:
-            sampled_points.append((sample_frame, keyframes[0].value))
-        elif sample_frame >= keyframes[-1].frame:
-            sampled_points.append((sample_frame, keyframes[-1].value))
-    
-    return sampled_points
-
-def evaluate_cubic_bezier(start_kf: KeyframeData, end_kf: KeyframeData, t: float) -> float:
+def evaluate_cubic_bezier(p0_values, p1_values, p2_values, p3_values, t):
     """
-    Evaluate a cubic Bezier curve between two keyframes at parameter t (0-1).
-    """
-    # Control points for the Bezier curve
-    p0_frame, p0_value = start_kf.frame, start_kf.value
-    p3_frame, p3_value = end_kf.frame, end_kf.value
-    
-    # Handle positions (absolute coordinates)
-    if start_kf.handle_right:
-        p1_frame = p0_frame + start_kf.handle_right[0]
-        p1_value = p0_value + start_kf.handle_right[1]
-    else:
-        p1_frame, p1_value = p0_frame, p0_value
-    
-    if end_kf.handle_left:
-        p2_frame = p3_frame + end_kf.handle_left[0]
-        p2_value = p3_value + end_kf.handle_left[1]
-    else:
-        p2_frame, p2_value = p3_frame, p3_value
-    
-    # Cubic Bezier formula: B(t) = (1-t)³P₀ + 3(1-t)²tP₁ + 3(1-t)t²P₂ + t³P₃
-    one_minus_t = 1 - t
-    
-    # We only need to interpolate the value (y-coordinate)
-    # The frame (x-coordinate) is determined by linear interpolation
-    bezier_value = (
-        one_minus_t**3 * p0_value +
-        3 * one_minus_t**2 * t * p1_value +
-        3 * one_minus_t * t**2 * p2_value +
-        t**3 * p3_value
-    )
-    
-    return bezier_value
-
-def calculate_curve_error(original_points: List[Tuple[float, float]], 
-                         approximated_points: List[Tuple[float, float]]) -> float:
+    Evaluate cubic Bezier values at parameter t (0-1), element-wise over NumPy arrays.
+    Only the value (y-coordinate) is interpolated, the frame is linear in t.
     """
-    Calculate the maximum error between original and approximated curves.
-    Uses interpolation to compare at the same frame positions.
-    """
-    if not original_points or not approximated_points:
-        return float('inf')
-    
-    max_error = 0.0
+    # B(t) = (1-t)³P₀ + 3(1-t)²tP₁ + 3(1-t)t²P₂ + t³P₃ expanded to power-basis coefficients for Horner's rule
+    c3 = p3_values - 3 * p2_values + 3 * p1_values - p0_values
+    c2 = 3 * (p2_values - 2 * p1_values + p0_values)
+    c1 = 3 * (p1_values - p0_values)
     
-    # Create interpolation function for approximated curve
-    approx_frames = [p[0] for p in approximated_points]
-    approx_values = [p[1] for p in approximated_points]
-    
-    for orig_frame, orig_value in original_points:
-        # Find approximated value at this frame using linear interpolation
-        approx_value = interpolate_value(orig_frame, approx_frames, approx_values)
-        
-        error = abs(orig_value - approx_value)
-        max_error = max(max_error, error)
-    
-    return max_error
+    return ((c3 * t + c2) * t + c1) * t + p0_values
 
-def interpolate_value(target_frame: float, frames: List[float], values: List[float]) -> float:
+def _segment_error(keyframes: KeyframeArray, segment: int, keyframe_points: List[int],
+                   original_frames: np.ndarray, original_values: np.ndarray) -> Tuple[float, int]:
     """
-    Interpolate a value at target_frame using linear interpolation between known points.
+    Maximum error of one Bezier segment against the original points strictly inside it.
+    Returns (max_error, index of the original point with that error).
     """
-    if target_frame <= frames[0]:
-        return values[0]
-    if target_frame >= frames[-1]:
-        return values[-1]
-    
-    # Find the segment containing target_frame
-    for i in range(len(frames) - 1):
-        if frames[i] <= target_frame <= frames[i + 1]:
-            # Linear interpolation
-            t = ((target_frame - frames[i]) / 
-                 (frames[i + 1] - frames[i]) if frames[i + 1] != frames[i] else 0)
-            return values[i] + t * (values[i + 1] - values[i])
-    
-    return values[0]  # Fallback
+    start_point = keyframe_points[segment]
+    end_point = keyframe_points[segment + 1]
+    if end_point - start_point < 2:
+        return 0.0, start_point
+    
+    frames = original_frames[start_point + 1:end_point]
+    start_frame = keyframes.frames[segment]
+    end_frame = keyframes.frames[segment + 1]
+    ts = (frames - start_frame) / (end_frame - start_frame)
+    
+    # Handles are relative offsets, NaN where a keyframe has none
+    p0_value = keyframes.values[segment]
+    p3_value = keyframes.values[segment + 1]
+    right_offset = keyframes.handle_right_y[segment]
+    left_offset = keyframes.handle_left_y[segment + 1]
+    p1_value = p0_value + (0.0 if math.isnan(right_offset) else right_offset)
+    p2_value = p3_value + (0.0 if math.isnan(left_offset) else left_offset)
+    
+    errors = np.abs(original_values[start_point + 1:end_point] -
+                    evaluate_cubic_bezier(p0_value, p1_value, p2_value, p3_value, ts))
+    max_offset = int(np.argmax(errors))
+    return float(errors[max_offset]), start_point + 1 + max_offset
 
-def iterative_refinement(keyframes: List[KeyframeData], 
-                        original_points: List[Tuple[float, float]],
+def iterative_refinement(keyframes: KeyframeArray, 
+                        original_points: np.ndarray,
                         error_tolerance: float,
-                        max_iterations: int = 10) -> List[KeyframeData]:
+                        max_iterations: int = 10) -> KeyframeArray:
     """
     Iteratively refine the keyframes by adding points where error is highest.
+    Segments between keyframes are kept in a max-heap keyed by their worst error; adding a
+    keyframe only re-measures the segments whose handles it changed.
+    original_points: (N, 2) float64 array of (frame, value) rows.
+    Keyframes must sit on original points and include the first and last one.
     """
-    current_keyframes = keyframes[:]
+    current_keyframes = keyframes
+    if len(current_keyframes) < 2:
+        return current_keyframes
+    
+    original = np.asarray(original_points, dtype=np.float64)
+    original_frames = original[:, 0]
+    original_values = original[:, 1]
+    
+    # Original point index of every keyframe
+    keyframe_points = np.searchsorted(original_frames, current_keyframes.frames).tolist()
+    
+    # Heap entries are (-error, start point, end point, worst point, entry id); live maps each
+    # current segment to its latest entry id so superseded entries can be skipped lazily
+    heap = []
+    live = {}
+    entry_ids = itertools.count()
+    
+    def measure_segments(segments):
+        for segment in segments:
+            if 0 <= segment < len(keyframe_points) - 1:
+                error, point_index = _segment_error(current_keyframes, segment, keyframe_points,
+                                                    original_frames, original_values)
+                entry = (-error, keyframe_points[segment], keyframe_points[segment + 1], point_index, next(entry_ids))
+                live[entry[1:3]] = entry[4]
+                heapq.heappush(heap, entry)
+    
+    measure_segments(range(len(keyframe_points) - 1))
     
     for iteration in range(max_iterations):
-        print(f"Refinement iteration {iteration + 1}")
+        if DEBUG:
+            print(f"Refinement iteration {iteration + 1}")
         
-        # Evaluate current curve
-        start_frame = original_points[0][0]
-        end_frame = original_points[-1][0]
-        approximated = evaluate_bezier_curve(current_keyframes, start_frame, end_frame, 
-                                           len(original_points))
+        # Drop entries for segments that were split or re-measured since they were pushed
+        while heap and live.get(heap[0][1:3]) != heap[0][4]:
+            heapq.heappop(heap)
         
-        # Calculate error
-        max_error = calculate_curve_error(original_points, approximated)
-        print(f"  Current max error: {max_error:.6f} (tolerance: {error_tolerance})")
+        max_error = -heap[0][0] if heap else 0.0
+        if DEBUG:
+            print(f"  Current max error: {max_error:.6f} (tolerance: {error_tolerance})")
         
         if max_error <= error_tolerance:
-            print(f"  Converged! Error within tolerance.")
+            if DEBUG:
+                print(f"  Converged! Error within tolerance.")
             break
         
-        # Find point with maximum error
-        max_error_frame = None
-        max_error_value = 0
-        
-        # Create interpolation for current approximation
-        approx_frames = [p[0] for p in approximated]
-        approx_values = [p[1] for p in approximated]
+        # Split the worst segment with a new keyframe at its point of maximum error
+        _, start_point, end_point, max_error_index, _ = heapq.heappop(heap)
+        del live[(start_point, end_point)]
         
-        for orig_frame, orig_value in original_points:
-            approx_value = interpolate_value(orig_frame, approx_frames, approx_values)
-            error = abs(orig_value - approx_value)
-            
-            if error > max_error_value:
-                max_error_value = error
-                max_error_frame = orig_frame
-        
-        if max_error_frame is None:
-            break
+        position = bisect.bisect_right(keyframe_points, max_error_index)
+        keyframe_points.insert(position, max_error_index)
+        current_keyframes = current_keyframes.insert(original_frames[max_error_index], original_values[max_error_index])
         
-        # Add a new keyframe at the point of maximum error
-        # Find the original point data
-        new_keyframe = None
-        for frame, value in original_points:
-            if frame == max_error_frame:
-                new_keyframe = KeyframeData(frame, value)
-                break
+        # Recalculate handles; tangents change for the new keyframe and both neighbours,
+        # so only the two segments on either side of it need measuring again
+        current_keyframes = calculate_bezier_handles(current_keyframes)
+        measure_segments(range(position - 2, position + 2))
         
-        if new_keyframe:
-            # Insert in the correct position
-            inserted = False
-            for i in range(len(current_keyframes)):
-                if current_keyframes[i].frame > new_keyframe.frame:
-                    current_keyframes.insert(i, new_keyframe)
-                    inserted = True
-                    break
-            
-            if not inserted:
-                current_keyframes.append(new_keyframe)
-            
-            # Recalculate handles for all keyframes
-            current_keyframes = calculate_bezier_handles(current_keyframes, original_points)
-            
-            print(f"  Added keyframe at frame {max_error_frame} (error was {max_error_value:.6f})")
-        else:
-            break
+        if DEBUG:
+            print(f"  Added keyframe at frame {original_frames[max_error_index]} (error was {max_error:.6f})")
     
-    print(f"Refinement completed after {min(iteration + 1, max_iterations)} iterations")
+    if DEBUG:
+        print(f"Refinement completed after {min(iteration + 1, max_iterations)} iterations")
     return current_keyframes
 
 
@@ -440,45 +458,41 @@ def convert_to_blender_keyframes(keyframe_data: List[KeyframeData],
     """
     try:
         import bpy
+        from .animation_operators_utils import set_constraint_keyframes
+        
+        if DEBUG:
+            print(f"Applying {len(keyframe_data)} keyframes to {data_path}")
+        if not keyframe_data:
+            return
+        
+        # Write every keyframe in one batch; the fcurve update computes automatic handles for all of them
+        keyframes = KeyframeArray.from_objects(keyframe_data)
+        fcurve = set_constraint_keyframes(constraint, data_path, np.column_stack((keyframes.frames, keyframes.values)),
+                                          interpolation='BEZIER')
+        keyframe_points = fcurve.keyframe_points
+        point_count = len(keyframe_points)
         
-        print(f"Applying {len(keyframe_data)} keyframes to {data_path}")
+        # Free handles, so the calculated positions below are kept as set
+        keyframe_props = bpy.types.Keyframe.bl_rna.properties
+        free_handles = np.full(point_count, keyframe_props['handle_left_type'].enum_items['FREE'].value, dtype=np.int32)
+        keyframe_points.foreach_set("handle_left_type", free_handles)
+        keyframe_points.foreach_set("handle_right_type", free_handles)
         
-        for kf_data in keyframe_data:
-            # Set the value and create keyframe
-            setattr(constraint, data_path.split('.')[-1], kf_data.value)
-            constraint.keyframe_insert(data_path=data_path, frame=kf_data.frame)
+        # Apply calculated handles (relative offsets -> absolute positions) where available,
+        # keyframes without one keep their automatic handle
+        for handle_attr, offsets_x, offsets_y in (
+                ("handle_left", keyframes.handle_left_x, keyframes.handle_left_y),
+                ("handle_right", keyframes.handle_right_x, keyframes.handle_right_y)):
+            handles = np.empty(point_count * 2, dtype=np.float32)
+            keyframe_points.foreach_get(handle_attr, handles)
+            handles = handles.reshape(-1, 2)
+            has_handle = ~np.isnan(offsets_x)
+            handles[has_handle, 0] = keyframes.frames[has_handle] + offsets_x[has_handle]
+            handles[has_handle, 1] = keyframes.values[has_handle] + offsets_y[has_handle]
+            keyframe_points.foreach_set(handle_attr, handles.ravel())
         
-        # Set interpolation mode and handles
-        if hasattr(constraint, 'id_data') and constraint.id_data.animation_data:
-            action = constraint.id_data.animation_data.action
-            constraint_path = f'constraints["{constraint.name}"].{data_path}'
-            
-            for fcurve in action.fcurves:
-                if fcurve.data_path == constraint_path:
-                    # Set all keyframes to Bezier
-                    for i, keypoint in enumerate(fcurve.keyframe_points):
-                        keypoint.interpolation = 'BEZIER'
-                        
-                        # Set handle types
-                        keypoint.handle_left_type = 'FREE'
-                        keypoint.handle_right_type = 'FREE'
-                        
-                        # Apply calculated handles if available
-                        if i < len(keyframe_data):
-                            kf_data = keyframe_data[i]
-                            
-                            if kf_data.handle_left:
-                                left_frame = kf_data.frame + kf_data.handle_left[0]
-                                left_value = kf_data.value + kf_data.handle_left[1]
-                                keypoint.handle_left = (left_frame, left_value)
-                            
-                            if kf_data.handle_right:
-                                right_frame = kf_data.frame + kf_data.handle_right[0]
-                                right_value = kf_data.value + kf_data.handle_right[1]
-                                keypoint.handle_right = (right_frame, right_value)
-                    
-                    print(f"Applied Bezier handles to {len(fcurve.keyframe_points)} keyframes")
-                    break
+        if DEBUG:
+            print(f"Applied Bezier handles to {point_count} keyframes")
         
     except Exception as e:
         print(f"Error applying keyframes to Blender: {e}")
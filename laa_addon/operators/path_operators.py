@@ -6,6 +6,8 @@ import bpy
 from mathutils import Vector
 from bpy.types import Operator
 
+from .animation_operators_utils import clear_selection, get_control_point_objects, find_armature, register_classes, unregister_classes
+
 class ANIMPATH_OT_set_start_position(Operator):
     """Set start position from 3D cursor"""
     bl_idname = "animpath.set_start_position"
@@ -66,9 +68,10 @@ class ANIMPATH_OT_create_path(Operator):
                 curve_obj["use_rotation"] = props.use_rotation
                 curve_obj["object_z_offset"] = props.object_z_offset
             
-            bpy.ops.object.select_all(action='DESELECT')
+            clear_selection(context)
             curve_obj.select_set(True)
             context.view_layer.objects.active = curve_obj
+            context.scene["_laa_dirty"] = True
             
             self.report({'INFO'}, f"Created Animation Path: {curve_obj.name} (Frames: {path.start_frame}-{path.end_frame})")
             
@@ -137,6 +140,9 @@ class ANIMPATH_OT_update_path(Operator):
                         new_pos = getattr(props, f"{point_type}_pos")
                         point_obj.location = new_pos
             
+            # Let the selection handler reload the panel from the updated path
+            context.scene["_laa_dirty"] = True
+            
             self.report({'INFO'}, f"Updated Animation Path: {obj.name} (Frames: {path.start_frame}-{path.end_frame})")
             
         except ValueError as e:
@@ -205,7 +211,7 @@ class ANIMPATH_OT_delete_path(Operator):
                 objects_to_delete.append(scene_obj)
         
         # Clear selection to avoid issues
-        bpy.ops.object.select_all(action='DESELECT')
+        clear_selection(context)
         
         # Delete all objects
         deleted_count = 0
@@ -250,11 +256,9 @@ class ANIMPATH_OT_delete_path(Operator):
             cleanup_performed |= self._cleanup_object_animation(target_obj, path_name, path_obj)
             
             # Find and clean up armature animation data
-            armature_obj = self._find_armature(target_obj)
-            if armature_obj and armature_obj != target_obj:
-                cleanup_performed |= self._cleanup_armature_animation(armature_obj, path_name)
-            elif armature_obj == target_obj:
-                # If target is the armature, clean up NLA strips but preserve any follow path keyframes
+            armature_obj = find_armature(target_obj)
+            # When the target is the armature itself this only touches NLA strips, so follow path keyframes are preserved
+            if armature_obj:
                 cleanup_performed |= self._cleanup_armature_animation(armature_obj, path_name)
             
             return cleanup_performed
@@ -375,31 +379,6 @@ class ANIMPATH_OT_delete_path(Operator):
             print(f"Error during armature animation cleanup: {e}")
         
         return cleanup_performed
-    
-    def _find_armature(self, target_obj):
-        """Find an armature object - either the target itself or its child"""
-        # Check if target is an armature
-        if target_obj.type == 'ARMATURE':
-            return target_obj
-        
-        # Check direct children for armature
-        for child in target_obj.children:
-            if child.type == 'ARMATURE':
-                return child
-        
-        # Check if target has an armature modifier pointing to an armature
-        if hasattr(target_obj, 'modifiers'):
-            for modifier in target_obj.modifiers:
-                if modifier.type == 'ARMATURE' and modifier.object:
-                    return modifier.object
-        
-        # Recursively check children's children (one level deep)
-        for child in target_obj.children:
-            for grandchild in child.children:
-                if grandchild.type == 'ARMATURE':
-                    return grandchild
-        
-        return None
 
 class ANIMPATH_OT_load_path_to_properties(Operator):
     """Load selected Animation Path data to properties panel"""
@@ -461,35 +440,17 @@ class ANIMPATH_OT_reset_curve_to_control_points(Operator):
             self.report({'ERROR'}, "No Animation Path selected")
             return {'CANCELLED'}
         
-        control_points = {}
+        sp, ep = get_control_point_objects(obj)
         
-        for point_type in ["start", "end"]:
-            point_name = obj.get(f"{point_type}_control_point")
-            if point_name:
-                point_obj = bpy.data.objects.get(point_name)
-                if point_obj:
-                    control_points[point_type] = point_obj.location.copy()
-        
-        if len(control_points) < 2:
+        if not sp or not ep:
             self.report({'ERROR'}, "Need start and end control points to reset curve")
             return {'CANCELLED'}
         
-        curve_data = obj.data
-        spline = curve_data.splines[0]
+        # Import here to avoid circular imports
+        from ..animation_path import set_straight_spline_points
         
-        start_pos = control_points.get("start")
-        end_pos = control_points.get("end")
-        direction = end_pos - start_pos
-        
-        for i in range(5):
-            t = i / 4.0
-            if i == 0:
-                pos = start_pos
-            elif i == 4:
-                pos = end_pos
-            else:
-                pos = start_pos + direction * t
-            spline.points[i].co = (pos.x, pos.y, pos.z, 1.0)
+        spline = obj.data.splines[0]
+        set_straight_spline_points(spline, sp.location, ep.location)
         
         self.report({'INFO'}, "Reset curve to control points")
         return {'FINISHED'}
@@ -508,23 +469,8 @@ classes = [
 
 def register():
     """Register path operators"""
-    for cls in classes:
-        try:
-            bpy.utils.register_class(cls)
-        except ValueError as e:
-            if "already registered" in str(e):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    bpy.utils.register_class(cls)
-                except:
-                    print(f"Warning: Could not register class {cls.__name__}: {e}")
-            else:
-                print(f"Error registering class {cls.__name__}: {e}")
+    register_classes(classes)
 
 def unregister():
     """Unregister path operators"""
-    for cls in reversed(classes):
-        try:
-            bpy.utils.unregister_class(cls)
-        except:
-            pass
\ No newline at end of file
+    unregister_classes(classes)
\ No newline at end of file
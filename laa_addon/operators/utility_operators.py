@@ -5,6 +5,13 @@ Utility operators for animation library management and other general functions
 import bpy
 from bpy.types import Operator
 
+from .animation_operators_utils import clear_selection, register_classes, unregister_classes
+
+try:
+    from .. import animation_library
+except ImportError:
+    import animation_library
+
 class ANIMPATH_OT_refresh_animation_library(Operator):
     """Refresh the animation library cache"""
     bl_idname = "animpath.refresh_animation_library"
@@ -13,8 +20,6 @@ class ANIMPATH_OT_refresh_animation_library(Operator):
     
     def execute(self, context):
         try:
-            from .. import animation_library
-            
             animation_library.refresh_animation_library()
             
             # Count available items
@@ -40,8 +45,6 @@ class ANIMPATH_OT_clear_animation_cache(Operator):
     
     def execute(self, context):
         try:
-            from .. import animation_library
-            
             animation_library.clear_action_cache()
             self.report({'INFO'}, "Animation cache cleared")
             
@@ -59,7 +62,7 @@ class ANIMPATH_OT_select_all_paths(Operator):
     
     def execute(self, context):
         # Clear current selection
-        bpy.ops.object.select_all(action='DESELECT')
+        clear_selection(context)
         
         # Select all animation path objects
         selected_count = 0
@@ -144,8 +147,6 @@ class ANIMPATH_OT_validate_animation_library(Operator):
     
     def execute(self, context):
         try:
-            from .. import animation_library
-            
             # Get available poses and animations
             poses = animation_library.get_available_poses(None, context)
             animations = animation_library.get_available_animations(None, context)
@@ -202,23 +203,8 @@ classes = [
 
 def register():
     """Register utility operators"""
-    for cls in classes:
-        try:
-            bpy.utils.register_class(cls)
-        except ValueError as e:
-            if "already registered" in str(e):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    bpy.utils.register_class(cls)
-                except:
-                    print(f"Warning: Could not register class {cls.__name__}: {e}")
-            else:
-                print(f"Error registering class {cls.__name__}: {e}")
+    register_classes(classes)
 
 def unregister():
     """Unregister utility operators"""
-    for cls in reversed(classes):
-        try:
-            bpy.utils.unregister_class(cls)
-        except:
-            pass
\ No newline at end of file
+    unregister_classes(classes)
\ No newline at end of file
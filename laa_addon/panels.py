@@ -25,6 +25,11 @@ except ImportError:
         animation_library_available = False
         print("Animation library not available")
 
+try:
+    from .operators.animation_operators_utils import register_classes, unregister_classes
+except ImportError:
+    from operators.animation_operators_utils import register_classes, unregister_classes
+
 class ANIMPATH_PT_main_panel(Panel):
     """Main Animation Path panel in 3D Viewport sidebar"""
     bl_label = "Animation Paths"
@@ -211,10 +216,9 @@ class ANIMPATH_PT_object_animation(Panel):
                 return True
         
         # Check if target has an armature modifier pointing to an armature
-        if hasattr(target_obj, 'modifiers'):
-            for modifier in target_obj.modifiers:
-                if modifier.type == 'ARMATURE' and modifier.object:
-                    return True
+        for modifier in target_obj.modifiers:
+            if modifier.type == 'ARMATURE' and modifier.object:
+                return True
         
         # Recursively check children's children (one level deep)
         for child in target_obj.children:
@@ -236,10 +240,9 @@ class ANIMPATH_PT_object_animation(Panel):
                 return child.name
         
         # Check if target has an armature modifier pointing to an armature
-        if hasattr(target_obj, 'modifiers'):
-            for modifier in target_obj.modifiers:
-                if modifier.type == 'ARMATURE' and modifier.object:
-                    return modifier.object.name
+        for modifier in target_obj.modifiers:
+            if modifier.type == 'ARMATURE' and modifier.object:
+                return modifier.object.name
         
         # Recursively check children's children (one level deep)
         for child in target_obj.children:
@@ -323,27 +326,8 @@ classes = [
 ]
 
 def register():
-    try:
-        unregister()
-    except:
-        pass
-    
-    for cls in classes:
-        try:
-            bpy.utils.register_class(cls)
-        except ValueError as e:
-            if "already registered" in str(e):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    bpy.utils.register_class(cls)
-                except:
-                    print(f"Warning: Could not register class {cls.__name__}: {e}")
-            else:
-                print(f"Error registering class {cls.__name__}: {e}")
+    # Replaces classes still registered from a previous load (addon reload)
+    register_classes(classes)
 
 def unregister():
-    for cls in reversed(classes):
-        try:
-            bpy.utils.unregister_class(cls)
-        except:
-            pass
\ No newline at end of file
+    unregister_classes(classes)
@@ -11,6 +11,11 @@ from bpy.props import (
 )
 from mathutils import Vector
 
+try:
+    from .operators.animation_operators_utils import register_classes, unregister_classes
+except ImportError:
+    from operators.animation_operators_utils import register_classes, unregister_classes
+
 def property_update_callback(self, context):
     """Callback function for when properties are updated"""
     # Import here to avoid circular imports
@@ -248,28 +253,9 @@ classes = [
 ]
 
 def register():
-    try:
-        unregister()
-    except:
-        pass
-    
-    for cls in classes:
-        try:
-            bpy.utils.register_class(cls)
-        except ValueError as e:
-            if "already registered" in str(e):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    bpy.utils.register_class(cls)
-                except:
-                    print(f"Warning: Could not register class {cls.__name__}: {e}")
-            else:
-                print(f"Error registering class {cls.__name__}: {e}")
-    
-    try:
-        bpy.types.Scene.animation_path_props = PointerProperty(type=AnimationPathProperties)
-    except:
-        pass
+    # Replaces classes still registered from a previous load (addon reload)
+    register_classes(classes)
+    bpy.types.Scene.animation_path_props = PointerProperty(type=AnimationPathProperties)
 
 def unregister():
     try:
@@ -277,8 +263,4 @@ def unregister():
     except:
         pass
     
-    for cls in reversed(classes):
-        try:
-            bpy.utils.unregister_class(cls)
-        except:
-            pass
\ No newline at end of file
+    unregister_classes(classes)
@@ -0,0 +1,45 @@
+"""
+Tests for the bpy-free numeric kernels in laa_addon/math_kernels.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Import the module directly; the laa_addon package itself needs bpy
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "laa_addon"))
+
+import math_kernels
+
+
+def _straight_polyline(count=200):
+    return np.column_stack((np.linspace(0.0, 10.0, count), np.zeros(count), np.zeros(count)))
+
+
+def _corner_polyline(count=200):
+    # Straight run along X, then a right-angle turn onto Y
+    half = count // 2
+    xs = np.concatenate((np.linspace(0.0, 5.0, half), np.full(count - half, 5.0)))
+    ys = np.concatenate((np.zeros(half), np.linspace(0.0, 5.0, count - half + 1)[1:]))
+    return np.column_stack((xs, ys, np.zeros(count)))
+
+
+def test_straight_polyline_has_uniform_speed_profile():
+    positions = _straight_polyline()
+    assert math_kernels.speed_profile_frame_positions(positions, 100, 0.1, 0.5, 1.0) is None
+    assert math_kernels._speed_profile_numpy(positions, 100, 0.1, 0.5, 1.0, 3, 10) is None
+    assert len(math_kernels._speed_profile_jit(positions, 100, 0.1, 0.5, 1.0, 3, 10)) == 0
+
+
+def test_corner_polyline_varies_speed():
+    positions = _corner_polyline()
+    frame_positions = math_kernels._speed_profile_numpy(positions, 100, 0.1, 0.5, 1.0, 3, 10)
+    assert frame_positions is not None
+    assert frame_positions[0] == 0.0 and frame_positions[-1] == 1.0
+    assert np.all(np.diff(frame_positions) >= 0.0)
+    # Not linear in the frame
+    assert not np.allclose(frame_positions, np.linspace(0.0, 1.0, 101))
+
+    jit_positions = math_kernels._speed_profile_jit(positions, 100, 0.1, 0.5, 1.0, 3, 10)
+    assert np.allclose(frame_positions, jit_positions)